@@ -1,14 +1,11 @@
 import streamlit as st
 import json
 import asyncio
-import nest_asyncio
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, is_dataclass
 from typing import Dict, Any, Optional
 
 
-# Apply nest_asyncio to allow nested event loops
-nest_asyncio.apply()
-
 # Create a new event loop
 loop = asyncio.new_event_loop()
 asyncio.set_event_loop(loop)
@@ -18,12 +15,6 @@ from subfields import ASTRONOMY_SUBFIELDS
 from reflection_agent import AstronomyReflectionAgent, ProposalFeedback
 from literature_agent import LiteratureAgent, LiteratureFeedback
 
-# Import Google GenAI for backward compatibility
-try:
-    from google import genai
-except ImportError:
-    genai = None
-
 
 def initialize_session_state():
     """Initialize session state variables for chat."""
@@ -200,6 +191,30 @@ def initialize_or_update_agents():
             )
 
 
+def run_reviews(structured_idea: Dict[str, Any]) -> tuple[Optional[Exception], Optional[LiteratureFeedback], Optional[ProposalFeedback]]:
+    """
+    Runs the literature search and the expert review of an idea concurrently.
+    Both only read the idea and spend their time waiting on network calls, so
+    overlapping them saves one round of latency. Returns (literature_error,
+    literature_feedback, reflection); errors from the expert review propagate.
+    """
+    # Read session state here; worker threads have no Streamlit script context
+    literature_agent = None if st.session_state.skip_literature_review else st.session_state.literature_agent
+    reflection_agent = st.session_state.reflection_agent
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        literature_future = executor.submit(literature_agent.run_literature_search, structured_idea) if literature_agent else None
+        reflection_future = executor.submit(reflection_agent.provide_feedback, research_proposal=structured_idea)
+
+        literature_error, literature_feedback = None, None
+        if literature_future:
+            try:
+                literature_feedback = literature_future.result()
+            except Exception as e:
+                literature_error = e
+        return literature_error, literature_feedback, reflection_future.result()
+
+
 def run_refinement_pipeline(user_idea: str) -> tuple[Optional[Dict], Optional[LiteratureFeedback], Optional[ProposalFeedback], Optional[Dict]]:
     """
     Runs the full refinement pipeline and returns the structured data.
@@ -228,21 +243,13 @@ def run_refinement_pipeline(user_idea: str) -> tuple[Optional[Dict], Optional[Li
             st.error("Could not structure or refine the idea.")
             return None, None, None, None
 
-        if not st.session_state.skip_literature_review:
-            with st.spinner("Performing literature search..."):
-                try:
-                    literature_feedback = st.session_state.literature_agent.run_literature_search(
-                        structured_idea
-                    )
-                    st.session_state.literature_feedback = literature_feedback
-                except Exception as e:
-                    st.error(f"An error occurred during the literature search: {e}")
-                    return None, None, None, None
-
-        with st.spinner("Step 3: Getting expert feedback..."):
-            reflection = st.session_state.reflection_agent.provide_feedback(
-                research_proposal=structured_idea
-            )
+        with st.spinner("Steps 2-3: Searching the literature and getting expert feedback..."):
+            literature_error, literature_feedback, reflection = run_reviews(structured_idea)
+            if literature_error:
+                st.error(f"An error occurred during the literature search: {literature_error}")
+                return None, None, None, None
+            if literature_feedback:
+                st.session_state.literature_feedback = literature_feedback
             st.session_state.reflection = reflection
         
         with st.spinner("Step 4: Generating improved proposal..."):
@@ -281,21 +288,13 @@ def run_generation_pipeline() -> tuple[Optional[Dict], Optional[LiteratureFeedba
                 st.error("Could not generate an idea. Try adjusting the context in the sidebar.")
                 return None, None, None, None
 
-        if not st.session_state.skip_literature_review:
-            with st.spinner("Performing literature search..."):
-                try:
-                    literature_feedback = st.session_state.literature_agent.run_literature_search(
-                        structured_idea
-                    )
-                    st.session_state.literature_feedback = literature_feedback
-                except Exception as e:
-                    st.error(f"An error occurred during the literature search: {e}")
-                    return None, None, None, None
-
-        with st.spinner("Step 3: Getting expert feedback..."):
-            reflection = st.session_state.reflection_agent.provide_feedback(
-                research_proposal=structured_idea
-            )
+        with st.spinner("Steps 2-3: Searching the literature and getting expert feedback..."):
+            literature_error, literature_feedback, reflection = run_reviews(structured_idea)
+            if literature_error:
+                st.error(f"An error occurred during the literature search: {literature_error}")
+                return None, None, None, None
+            if literature_feedback:
+                st.session_state.literature_feedback = literature_feedback
             
         with st.spinner("Step 4: Generating improved proposal..."):
             if reflection:
@@ -0,0 +1,84 @@
+"""Lazily loaded sentence-embedding model shared by the semantic caches.
+
+sentence-transformers is an optional dependency. When it is not installed,
+encode() returns None and the callers skip their embedding-based paths.
+The same model backs the optional KeyBERT keyword extractor.
+"""
+from typing import Any, List, Optional
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+# Texts per forward pass; one search's abstracts fit in a single batch
+ENCODE_BATCH_SIZE = 64
+
+_model = None
+_model_unavailable = False
+_keyword_model = None
+
+
+def get_embedding_model():
+    """Load the embedding model on first use, or return None if it is unavailable."""
+    global _model, _model_unavailable
+    if _model is None and not _model_unavailable:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            _model_unavailable = True
+            return None
+        _model = SentenceTransformer(EMBEDDING_MODEL_NAME, device=_select_device())
+    return _model
+
+
+def _select_device() -> str:
+    """Pick CUDA or Apple MPS when available, otherwise the CPU."""
+    import torch  # installed with sentence-transformers
+    if torch.cuda.is_available():
+        return "cuda"
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def encode(texts: List[str]) -> Optional["numpy.ndarray"]:
+    """Embed texts as L2-normalized float32 rows, so dot products are cosine similarities."""
+    model = get_embedding_model()
+    if model is None:
+        return None
+    vectors = model.encode(texts, batch_size=ENCODE_BATCH_SIZE, convert_to_numpy=True, normalize_embeddings=True)
+    return vectors.astype("float32")
+
+
+def encode_cached(texts: List[str], keys: List[Optional[str]], cache: Any) -> Optional["numpy.ndarray"]:
+    """Like encode(), but reuse vectors stored in cache under the given keys.
+
+    Texts with a None key are always embedded. New vectors are stored as float16,
+    which halves their size without a measurable effect on cosine similarities.
+    """
+    vectors = [cache.get(key) if key else None for key in keys]
+    missing = [position for position, vector in enumerate(vectors) if vector is None]
+    if missing:
+        fresh = encode([texts[position] for position in missing])
+        if fresh is None:
+            return None
+        for position, vector in zip(missing, fresh):
+            vectors[position] = vector
+            if keys[position]:
+                cache.set(keys[position], vector.astype("float16"))
+
+    import numpy as np
+    return np.stack(vectors).astype("float32")
+
+
+def extract_keywords(text: str, top_n: int = 6) -> Optional[List[str]]:
+    """Extract up to top_n key phrases from text with KeyBERT, or return None if it is unavailable."""
+    global _keyword_model
+    if _keyword_model is None:
+        model = get_embedding_model()
+        if model is None:
+            return None
+        try:
+            from keybert import KeyBERT
+        except ImportError:
+            return None
+        _keyword_model = KeyBERT(model=model)
+    keywords = _keyword_model.extract_keywords(text, keyphrase_ngram_range=(1, 2), stop_words="english", top_n=top_n)
+    return [keyword for keyword, _ in keywords]
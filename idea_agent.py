@@ -11,7 +11,7 @@ from subfields import AstronomySubfield, ASTRONOMY_SUBFIELDS
 import streamlit as st
 
 # Import the LLMClient wrapper
-from llm_client import LLMClient
+from llm_client import get_llm_client
 
 # Removed duplicate genai import attempt
 
@@ -24,7 +24,7 @@ class IdeaAgent:
         
         # Initialize the LLM client with the appropriate provider
         try:
-            self.llm_client = LLMClient(api_key, provider, temperature=self.temperature)
+            self.llm_client = get_llm_client(api_key, provider, self.temperature)
         except ValueError as e:
             raise ValueError(f"Error initializing idea agent: {str(e)}")
                 
@@ -167,19 +167,28 @@ Your response MUST be a single JSON object. Do not include any text outside the
         recommendations = reflection_feedback.get('recommendations', [])
         
         # Combine all feedback into a clear set of instructions
-        feedback_prompt_section = f"**Expert Professor's Feedback:**\n- Summary: {reflection_summary}\n- Recommendations:\n"
-        for rec in recommendations:
-            if isinstance(rec, dict):
-                feedback_prompt_section += f"  - {rec.get('recommendation', json.dumps(rec))}\n"
-            else:
-                feedback_prompt_section += f"  - {rec}\n"
+        feedback_lines = [
+            "**Expert Professor's Feedback:**",
+            f"- Summary: {reflection_summary}",
+            "- Recommendations:",
+        ]
+        feedback_lines.extend(
+            f"  - {rec.get('recommendation', json.dumps(rec))}" if isinstance(rec, dict) else f"  - {rec}"
+            for rec in recommendations
+        )
 
         if literature_feedback:
             lit_summary = literature_feedback.get('summary', 'No summary provided.')
             lit_suggestions = literature_feedback.get('differentiation_suggestions', [])
-            feedback_prompt_section += f"\n**Literature Review Feedback:**\n- Summary: {lit_summary}\n- Suggestions for Novelty:\n"
-            for sugg in lit_suggestions:
-                feedback_prompt_section += f"  - {sugg}\n"
+            feedback_lines.extend([
+                "",
+                "**Literature Review Feedback:**",
+                f"- Summary: {lit_summary}",
+                "- Suggestions for Novelty:",
+            ])
+            feedback_lines.extend(f"  - {sugg}" for sugg in lit_suggestions)
+
+        feedback_prompt_section = "\n".join(feedback_lines) + "\n"
 
         prompt = f"""
 You are an astronomy student revising your research proposal based on feedback from your professor and a literature review.
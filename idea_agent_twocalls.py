@@ -1,4 +1,5 @@
 import os
+import re
 import json
 import random
 from typing import List, Dict, Any, Optional
@@ -6,18 +7,87 @@ from typing import List, Dict, Any, Optional
 from subfields import AstronomySubfield, ASTRONOMY_SUBFIELDS # Assuming this import works
 
 # Import the LLMClient wrapper
-from llm_client import LLMClient # Assuming this import works
-
-# Try to import Google's genai library for backward compatibility
-try:
-    from google import genai
-except ImportError:
-    genai = None
+from llm_client import get_llm_client
+from text_utils import shrink_middle
 
 # NOTE: This file implements the two-call approach for initial idea generation.
 # It now includes the detailed topic selection logic from the original idea_agent.py
 # and the creativity prompts discussed.
 
+# Proposal sections returned by the solution call and by the improvement calls
+PROPOSAL_SECTIONS = [
+    "Solution Summary", "Background", "Methodology", "Expected Outcomes",
+    "Potential Challenges", "Required Skills", "Broader Connections"
+]
+IMPROVED_SECTIONS = [
+    "Background", "Methodology", "Expected Outcomes",
+    "Potential Challenges", "Required Skills", "Broader Connections"
+]
+
+def _string_object_schema(keys: List[str]) -> Dict[str, Any]:
+    """Build a response schema for a JSON object whose values are all strings."""
+    return {
+        "type": "OBJECT",
+        "properties": {key: {"type": "STRING"} for key in keys},
+        "required": list(keys)
+    }
+
+PROPOSAL_SCHEMA = _string_object_schema(["title"] + PROPOSAL_SECTIONS)
+IMPROVED_PROPOSAL_SCHEMA = _string_object_schema(["title"] + IMPROVED_SECTIONS)
+
+# Token budget for each previous section re-injected into an improvement prompt
+SECTION_TOKEN_BUDGET = 400
+
+# User feedback shorter than this is a small tweak and goes to the cheap model tier
+CHEAP_FEEDBACK_CHARS = 200
+
+# Phrases marking a sentence of the student's context as a research direction
+_INTEREST_INDICATORS = (
+    "interested in", "want to study", "focus on", "research on",
+    "investigate", "explore", "work on", "curious about", "question is",
+    "wondering about", "like to understand", "project on"
+)
+# Yields sentences lazily instead of materializing str.split('.')
+_SENTENCE_RE = re.compile(r'[^.]+')
+
+# Templated opening phrases of a methodology section, checked in this order
+_METHODOLOGY_INTRO_MARKERS = (
+    "to address the research question",
+    "we will use the following approach",
+    "will be addressed using",
+    "will be investigated using"
+)
+_METHODOLOGY_INTRO_RE = re.compile("|".join(map(re.escape, _METHODOLOGY_INTRO_MARKERS)), re.IGNORECASE)
+# Phrases marking a sentence that explains why the research matters
+_IMPORTANCE_RE = re.compile(
+    "|".join(map(re.escape, (
+        "important because", "significance of", "impact on", "contribute to",
+        "advances our", "enhances understanding", "addresses key"
+    ))),
+    re.IGNORECASE
+)
+
+def _key_concepts(description: str) -> List[str]:
+    """Pick description sentences that name a concept (more than 3 words, one capitalized)."""
+    key_concepts = []
+    for sentence in description.split('.'):
+        words = sentence.split()
+        if len(words) > 3 and any(word[0].isupper() for word in words if len(word) > 1):
+            clean_sentence = sentence.strip()
+            if clean_sentence:
+                key_concepts.append(clean_sentence)
+    return key_concepts
+
+def _format_resources(resources: List[str]) -> str:
+    """Sort and dedupe resources so every prompt embeds byte-identical resource text."""
+    return ", ".join(sorted(set(resources)))
+
+# The subfield table is static, so its match keys and key concepts are derived once at import
+_SUBFIELD_MATCH_KEYS = [
+    (subfield, frozenset([subfield.name, *subfield.related_fields])) for subfield in ASTRONOMY_SUBFIELDS
+]
+_SUBFIELD_KEY_CONCEPTS = {subfield.name: _key_concepts(subfield.description) for subfield in ASTRONOMY_SUBFIELDS}
+
 class IdeaAgentTwoCalls:
     """
     Stateful agent that generates astronomy research ideas using a two-call approach
@@ -30,7 +100,7 @@ class IdeaAgentTwoCalls:
 
         # Initialize the LLM client with the appropriate provider
         try:
-            self.llm_client = LLMClient(api_key, provider)
+            self.llm_client = get_llm_client(api_key, provider)
         except ValueError as e:
             raise ValueError(f"Error initializing idea agent: {str(e)}")
 
@@ -40,6 +110,8 @@ class IdeaAgentTwoCalls:
         self.student_profile = None
         self.feedback_history = []
         self.improvement_count = 0
+        self._compressed_sections = {} # (version, section) -> section trimmed for prompts
+        self._resources_str = "" # Normalized available resources, joined once per profile
 
     def generate_initial_idea(
         self,
@@ -52,6 +124,9 @@ class IdeaAgentTwoCalls:
         """
         Generate initial research idea using a two-step (question, then solution) approach.
         """
+        # A new idea restarts versioning, so drop compressed sections of the previous one
+        self._compressed_sections = {}
+
         # Store student profile
         self.student_profile = {
             "student_interests": student_interests or [random.choice(ASTRONOMY_SUBFIELDS).name],
@@ -60,6 +135,8 @@ class IdeaAgentTwoCalls:
             "available_resources": available_resources or ["Public astronomical datasets", "University computing cluster"],
             "additional_context": additional_context
         }
+        # Formatted once for the improvement prompts, which only see the stored profile
+        self._resources_str = _format_resources(self.student_profile["available_resources"])
 
         # --- Step 1: Generate Research Question ---
         generated_question_text = self._generate_research_question(
@@ -101,27 +178,23 @@ class IdeaAgentTwoCalls:
 
     def _generate_research_question(self, student_interests, skill_level, time_frame, available_resources, additional_context) -> str:
         """Generates *only* the research question text using an LLM call, including detailed topic selection."""
+        resources_str = _format_resources(available_resources)
 
         # --- Detailed Topic Selection Logic (from original idea_agent.py) ---
-        relevant_subfields = []
-        for subfield in ASTRONOMY_SUBFIELDS:
-            if subfield.name in student_interests or any(interest in subfield.related_fields for interest in student_interests):
-                relevant_subfields.append(subfield)
+        interests = set(student_interests)
+        relevant_subfields = [subfield for subfield, keys in _SUBFIELD_MATCH_KEYS if not keys.isdisjoint(interests)]
         if not relevant_subfields:
             relevant_subfields = random.sample(ASTRONOMY_SUBFIELDS, 2) # Fallback
 
         # Check if the user has specified research directions in additional_context
         user_specified_topics = []
         if additional_context and additional_context.strip():
-            context_sentences = additional_context.split('.')
-            for sentence in context_sentences:
-                sentence = sentence.strip()
-                interest_indicators = [
-                    "interested in", "want to study", "focus on", "research on",
-                    "investigate", "explore", "work on", "curious about", "question is",
-                    "wondering about", "like to understand", "project on"
-                ]
-                if any(indicator in sentence.lower() for indicator in interest_indicators) and len(sentence) > 20:
+            for match in _SENTENCE_RE.finditer(additional_context):
+                sentence = match.group().strip()
+                if len(sentence) <= 20:
+                    continue
+                sentence_lower = sentence.lower()
+                if any(indicator in sentence_lower for indicator in _INTEREST_INDICATORS):
                     user_specified_topics.append(sentence)
 
         # Initialize selected_topics
@@ -142,14 +215,7 @@ class IdeaAgentTwoCalls:
                     selected_challenges = random.sample(subfield.current_challenges, challenge_count)
                     random_topics_pool.extend(selected_challenges)
                 # Add key concepts from description
-                key_concepts = []
-                description_sentences = subfield.description.split('.')
-                for sentence in description_sentences:
-                    words = sentence.split()
-                    if len(words) > 3 and any(word[0].isupper() for word in words if len(word) > 1):
-                        clean_sentence = sentence.strip()
-                        if clean_sentence:
-                            key_concepts.append(clean_sentence)
+                key_concepts = _SUBFIELD_KEY_CONCEPTS[subfield.name]
                 if key_concepts:
                     concept_count = min(1, len(key_concepts))
                     selected_concepts = random.sample(key_concepts, concept_count)
@@ -179,7 +245,7 @@ Parameters:
 - Student interests: {', '.join(student_interests)}
 - Relevant subfields: {', '.join(subfield.name for subfield in relevant_subfields)}
 - Time frame: {time_frame}
-- Available resources: {', '.join(available_resources)}
+- Available resources: {resources_str}
 - Skill level: {skill_level}
 - Additional Student Context: {additional_context or "None provided."}
 
@@ -209,6 +275,7 @@ OR just the question itself.
 
     def _generate_solution_proposal(self, research_question, skill_level, time_frame, available_resources, student_interests, additional_context) -> Dict[str, Any]:
         """Generates the proposal sections (Background, Methodology, etc.) for a given research question."""
+        resources_str = _format_resources(available_resources)
 
         # Condensed scientific principles + creativity nudge
         condensed_guidelines = f"""
@@ -216,7 +283,7 @@ OR just the question itself.
 - Methods must be scientifically sound, clearly linked to the **provided research question**, and appropriate for the data/resources.
 - Claims must be realistic and proportional to what the methods and data can actually measure (consider S/N, statistical power, parameter degeneracies).
 - Describe phenomena and use terminology accurately according to established scientific understanding.
-- Scope: The project must be feasible for the student's level ({skill_level}), completable within the timeframe ({time_frame}), and utilize only the specified available resources ({', '.join(available_resources)}).
+- Scope: The project must be feasible for the student's level ({skill_level}), completable within the timeframe ({time_frame}), and utilize only the specified available resources ({resources_str}).
 - Enhance creativity by seeking scientifically plausible connections between different concepts, subfields, or techniques relevant to answering the question.
 """
 
@@ -231,40 +298,25 @@ Develop a detailed, scientifically sound, **novel,** and feasible research propo
 **Develop the proposal sections for a {skill_level} graduate student with this profile:**
 - Student interests: {', '.join(student_interests)}
 - Time frame: {time_frame}
-- Available resources: {', '.join(available_resources)}
+- Available resources: {resources_str}
 - Skill level: {skill_level}
 - Additional Student Context: {additional_context or "None provided."}
 
 {condensed_guidelines}
 
 **Output Format:**
-Generate ONLY the content for the following sections. Adhere strictly to the required headings and content guidelines:
-
-# [DESCRIPTIVE PROJECT TITLE]
-IMPORTANT: Create a SPECIFIC, DESCRIPTIVE title for the project addressing the provided Research Question.
-
-## Solution Summary
-Begin with: "To answer this question, we will use the following approach:" followed by 2-3 clear sentences outlining the key steps of the solution. Be concise and rigorous.
-Then in one sentence, explain the significance and impact of the proposed project by stating: "This project is impactful because...". Be concise and punchy. 
-
-## Background
-Provide 3-4 paragraphs explaining the context, significance, and knowledge gap related *specifically* to the Research Question. Why is this question important and timely?
-
-## Methodology
-Begin with: "To address the research question '{research_question}...', we will use the following approach:"
-Provide a CONCISE methodology (3-4 paragraphs: Data Acquisition/Processing, Analysis Approach, Validation/Interpretation). Specify data sources, methods, tools, and ensure a logical flow feasible within the constraints.
-
-## Expected Outcomes
-Describe at least three concrete, measurable results expected from answering the Research Question. How do they contribute to solving the identified problem?
-
-## Potential Challenges
-List potential challenges specific to this project and briefly suggest mitigation strategies.
-
-## Required Skills
-List precise technical and knowledge-based skills needed, suggesting how they could be developed.
-
-## Broader Connections
-Explain how answering this Research Question connects to larger questions in astronomy/astrophysics.
+Respond with a single JSON object matching the schema below. Each value is the content of that section as a string:
+
+{{
+  "title": "[A SPECIFIC, DESCRIPTIVE title for the project addressing the provided Research Question]",
+  "Solution Summary": "[Begin with: 'To answer this question, we will use the following approach:' followed by 2-3 clear sentences outlining the key steps of the solution. Then in one sentence, explain the significance and impact by stating: 'This project is impactful because...'. Be concise and punchy.]",
+  "Background": "[3-4 paragraphs explaining the context, significance, and knowledge gap related *specifically* to the Research Question. Why is this question important and timely?]",
+  "Methodology": "[Begin with: 'To address the research question '{research_question}...', we will use the following approach:' then a CONCISE methodology (3-4 paragraphs: Data Acquisition/Processing, Analysis Approach, Validation/Interpretation). Specify data sources, methods, tools, and ensure a logical flow feasible within the constraints.]",
+  "Expected Outcomes": "[At least three concrete, measurable results expected from answering the Research Question, and how they contribute to solving the identified problem.]",
+  "Potential Challenges": "[Potential challenges specific to this project, with brief mitigation strategies.]",
+  "Required Skills": "[Precise technical and knowledge-based skills needed, and how they could be developed.]",
+  "Broader Connections": "[How answering this Research Question connects to larger questions in astronomy/astrophysics.]"
+}}
 
 **IMPORTANT:** Focus entirely on developing a scientifically sound and feasible proposal *for the given Research Question*. Ensure all sections directly relate to answering it.
 """
@@ -272,64 +324,14 @@ Explain how answering this Research Question connects to larger questions in ast
         # print("Solution Prompt:", self.original_prompt_solution) # Optional: print prompt for debugging
 
         try:
-            solution_text = self.llm_client.generate_content(self.original_prompt_solution)
-            # Parse the generated text into sections
-            return self._parse_proposal_sections(solution_text)
+            # JSON mode returns the sections directly, no Markdown parsing needed
+            return self.llm_client.generate_json(self.original_prompt_solution, schema=PROPOSAL_SCHEMA)
         except Exception as e:
             print(f"Error generating solution proposal: {str(e)}")
             # Return dict with error indication
             return {"title": "Error", "Background": f"Failed to generate proposal: {e}"}
 
 
-    def _parse_proposal_sections(self, text: str) -> Dict[str, Any]:
-        """Parses the LLM response containing the proposal sections."""
-        parsed_output = {}
-        sections = [
-            "Solution Summary", "Background", "Methodology", "Expected Outcomes",
-            "Potential Challenges", "Required Skills", "Broader Connections"
-        ]
-        current_section = None
-        section_content = []
-
-        # Extract Title first
-        title = "Untitled Research Project" # Default
-        lines = text.split('\n')
-        for i, line in enumerate(lines):
-            # More robust title check - ensure it's not just a section header
-            if line.startswith('# ') and not any(f'## {s.lower()}' in line.lower() for s in sections) and not line.lower().startswith('# background'):
-                title = line.replace('# ', '').strip()
-                lines = lines[i+1:] # Remove title line from further processing
-                break
-        parsed_output["title"] = title
-
-        # Parse Sections
-        for line in lines:
-            stripped_line_lower = line.strip().lower()
-            found_section = False
-            for section_name in sections:
-                if stripped_line_lower == f'## {section_name.lower()}':
-                    if current_section and section_content:
-                        parsed_output[current_section] = '\n'.join(section_content).strip()
-                    current_section = section_name
-                    section_content = []
-                    found_section = True
-                    break # Found the section header for this line
-
-            if not found_section and current_section is not None:
-                section_content.append(line)
-
-        # Add the last section
-        if current_section and section_content:
-            parsed_output[current_section] = '\n'.join(section_content).strip()
-
-        # Ensure all expected sections are present, add placeholders if missing
-        for section in sections:
-            if section not in parsed_output:
-                parsed_output[section] = f"[Content for {section} not generated]"
-
-        return parsed_output
-
-
     def _combine_question_solution(self, question_text: str, solution_dict: Dict[str, Any], profile: Dict[str, Any]) -> Dict[str, Any]:
         """Combines the generated question and solution into the final idea structure."""
         
@@ -388,29 +390,23 @@ Explain how answering this Research Question connects to larger questions in ast
         if not methodology_text:
             return "using appropriate methodologies and data analysis techniques"
         
-        # Check if the text contains the templated intro sentence
-        intro_markers = [
-            "to address the research question", 
-            "we will use the following approach",
-            "will be addressed using",
-            "will be investigated using"
-        ]
-        
         # Find where the introduction ends and the actual approach begins
         start_pos = 0
         found_intro = False
+        methodology_lower = methodology_text.lower()
         
         # Look for the intro pattern, which typically ends with a colon
-        for marker in intro_markers:
-            if marker.lower() in methodology_text.lower():
+        for marker in _METHODOLOGY_INTRO_MARKERS:
+            marker_pos = methodology_lower.find(marker)
+            if marker_pos >= 0:
                 found_intro = True
-                colon_pos = methodology_text.lower().find(":", methodology_text.lower().find(marker))
+                colon_pos = methodology_lower.find(":", marker_pos)
                 if colon_pos > 0:
                     start_pos = colon_pos + 1
                     break
                 
                 # If no colon, try to find the end of the sentence
-                period_pos = methodology_text.lower().find(".", methodology_text.lower().find(marker))
+                period_pos = methodology_lower.find(".", marker_pos)
                 if period_pos > 0:
                     start_pos = period_pos + 1
                     break
@@ -441,7 +437,7 @@ Explain how answering this Research Question connects to larger questions in ast
         # Further fallback: Get any substantive content from the entire methodology
         sentences = methodology_text.split('.')
         # Skip any sentence with the introductory text
-        content_sentences = [s.strip() for s in sentences if s.strip() and not any(marker.lower() in s.lower() for marker in intro_markers)]
+        content_sentences = [s.strip() for s in sentences if s.strip() and not _METHODOLOGY_INTRO_RE.search(s)]
         if content_sentences:
             return self._format_first_sentences(content_sentences, 2)
         
@@ -453,21 +449,10 @@ Explain how answering this Research Question connects to larger questions in ast
         if not broader_connections_text:
             return "it will contribute to our understanding of astronomical phenomena and may have broader implications for the field"
         
-        # Look for key phrases indicating importance
-        importance_markers = [
-            "important because", 
-            "significance of", 
-            "impact on",
-            "contribute to",
-            "advances our",
-            "enhances understanding",
-            "addresses key"
-        ]
-        
         # Find a sentence containing an importance marker
         sentences = broader_connections_text.split('.')
         for sentence in sentences:
-            if any(marker.lower() in sentence.lower() for marker in importance_markers):
+            if _IMPORTANCE_RE.search(sentence):
                 return sentence.strip().lower()
         
         # If no explicit importance sentence found, use the first sentence
@@ -548,14 +533,14 @@ Explain how answering this Research Question connects to larger questions in ast
 
         # *** Create improvement prompt ***
         # Kept similar to original, but emphasizes addressing feedback for the *original question*
-        improvement_prompt = f"""
+        prompt_parts = [f"""
     You are an astronomy researcher revising your research proposal based on expert feedback and literature review.
 
     YOUR ORIGINAL PROPOSAL:
     Title: "{self.current_idea['title']}"
     Research Question: "{original_research_question}" # This is the initially generated question
-    Background: {self.current_idea['idea'].get('Background', '')}
-    Methodology: {self.current_idea['idea'].get('Methodology', '')}
+    Background: {self._compressed_section('Background')}
+    Methodology: {self._compressed_section('Methodology')}
     # ... (include other original sections if helpful) ...
 
     EXPERT FEEDBACK TO ADDRESS (relative to the original proposal):
@@ -563,110 +548,44 @@ Explain how answering this Research Question connects to larger questions in ast
     Methodological Concerns: {methodological_concerns_text or "None"}
     Expert Recommendations: {recommendations_text or "None"}
     Overall Assessment: {summary or "N/A"}
-    """
+    """]
         # Add literature review section if available
         if literature_insights:
-            improvement_prompt += f"""
+            prompt_parts.append(f"""
     LITERATURE REVIEW INSIGHTS (relative to the original proposal):
     Novelty Assessment (Score: {novelty_score}/10): {literature_insights.get('novelty_assessment', '')}
     Innovation Opportunities: {novel_suggestions_text or "None"}
     Emerging Research Trends: {emerging_trends or "None"}
     Novelty Recommendations: {literature_recommendations_text or "None"}
     Literature Summary: {literature_summary or "N/A"}
-    """
+    """)
 
         # Add instructions (tweaked based on previous discussion)
-        improvement_prompt += f"""
+        prompt_parts.append(f"""
     INSTRUCTIONS:
     Create an improved version of the research proposal sections (Background, Methodology, etc.) that addresses ALL feedback provided above (scientific, methodological, expert recommendations, and literature/novelty insights).
     The goal is to refine the approach for answering the **original Research Question:** "{original_research_question}".
-    Ensure the revised proposal is scientifically sound, feasible for the student profile ({self.student_profile['skill_level']}, {self.student_profile['time_frame']}, {', '.join(self.student_profile['available_resources'])}), and enhances novelty where possible.
-
-    Your response MUST follow this exact format:
-
-    # [Create a specific improved title here - NOT a placeholder]
-
-    ## Research Question
-    "{original_research_question}" # Reiterate the original question EXACTLY.
-
-    ## Background
-    [Improved background addressing feedback]
-
-    ## Methodology
-    [Improved methodology addressing feedback and feasibility]
-
-    ## Expected Outcomes
-    [Improved expected outcomes]
-
-    ## Potential Challenges
-    [Improved potential challenges]
-
-    ## Required Skills
-    [Improved required skills]
-
-    ## Broader Connections
-    [Improved broader connections]
-    """
+    Ensure the revised proposal is scientifically sound, feasible for the student profile ({self.student_profile['skill_level']}, {self.student_profile['time_frame']}, {self._resources_str}), and enhances novelty where possible.
+
+    Respond with a single JSON object with the following keys, each holding the improved section as a string.
+    Do NOT include the Research Question; it stays exactly as it is.
+
+    {{
+      "title": "[A specific improved title - NOT a placeholder]",
+      "Background": "[Improved background addressing feedback]",
+      "Methodology": "[Improved methodology addressing feedback and feasibility]",
+      "Expected Outcomes": "[Improved expected outcomes]",
+      "Potential Challenges": "[Improved potential challenges]",
+      "Required Skills": "[Improved required skills]",
+      "Broader Connections": "[Improved broader connections]"
+    }}
+    """)
+        improvement_prompt = "".join(prompt_parts)
 
         # Generate the improved idea
-        improved_idea_text = self.llm_client.generate_content(improvement_prompt)
-
-        # --- Parse the improved idea ---
-        # Re-using parsing logic, ensuring Research Question is not overwritten
-        parsed_improved_idea = {}
-        sections = [
-            "Research Question", "Background", "Methodology", "Expected Outcomes",
-            "Potential Challenges", "Required Skills", "Broader Connections"
-        ]
-        current_section = None
-        section_content = []
-
-        # Extract Title first
-        title = ""
-        lines = improved_idea_text.split('\n')
-        for i, line in enumerate(lines):
-             if line.startswith('# ') and not line.lower().startswith('# research question'):
-                  title = line.replace('# ', '').strip()
-                  lines = lines[i+1:]
-                  break
-        if not title or title.startswith("[Create a specific improved title"): title = f"Improved: {self.current_idea['title']}"
-        # Assign title directly to the idea being updated
-        self.current_idea['title'] = title
-
+        improved_sections = self._generate_improved_sections(improvement_prompt)
+        self._apply_improved_sections(improved_sections, original_research_question)
 
-        # Parse Sections, storing content temporarily
-        temp_parsed_sections = {}
-        for line in lines:
-            stripped_line_lower = line.strip().lower()
-            found_section = False
-            for section_name in sections:
-                 # Handle potential variations like "## Research Question" vs "## research question"
-                 if stripped_line_lower == f'## {section_name.lower()}':
-                      if current_section and section_content:
-                           temp_parsed_sections[current_section] = '\n'.join(section_content).strip()
-                      current_section = section_name
-                      section_content = []
-                      found_section = True
-                      break
-            if not found_section and current_section is not None:
-                 section_content.append(line)
-
-        # Add the last parsed section
-        if current_section and section_content:
-            temp_parsed_sections[current_section] = '\n'.join(section_content).strip()
-
-
-        # Update self.current_idea['idea'] carefully, preserving original question
-        for section in sections:
-            if section == "Research Question":
-                # Always keep the original question from self.current_idea
-                self.current_idea['idea'][section] = original_research_question
-            elif section in temp_parsed_sections and temp_parsed_sections[section]:
-                # Update with newly generated content if available
-                self.current_idea['idea'][section] = temp_parsed_sections[section]
-            # else: keep the potentially existing content from self.current_idea['idea'] if LLM failed to generate
-
-        # Update version number
         self.current_idea["version"] = self.improvement_count
 
         return self.current_idea
@@ -686,8 +605,8 @@ Explain how answering this Research Question connects to larger questions in ast
 
     YOUR ORIGINAL PROPOSAL SECTIONS (to answer the Research Question below):
     Title: "{self.current_idea['title']}"
-    Background: {self.current_idea['idea'].get('Background', '')}
-    Methodology: {self.current_idea['idea'].get('Methodology', '')}
+    Background: {self._compressed_section('Background')}
+    Methodology: {self._compressed_section('Methodology')}
     # ... (Include other sections if helpful) ...
 
     RESEARCH QUESTION (This should NOT be changed):
@@ -697,72 +616,66 @@ Explain how answering this Research Question connects to larger questions in ast
     {user_feedback}
 
     INSTRUCTIONS:
-    Create an improved version of the proposal sections (Background, Methodology, etc.) addressing the user's feedback, while maintaining scientific rigor and feasibility for the student profile ({self.student_profile['skill_level']}, {self.student_profile['time_frame']}, {', '.join(self.student_profile['available_resources'])}). The goal is to refine the approach for answering the **original Research Question**.
-
-    Your response MUST follow this exact format:
-    # [Create a specific improved title here - NOT a placeholder]
-    ## Research Question
-    "{original_research_question}" # Reiterate original question EXACTLY.
-    ## Background
-    [Improved background addressing user feedback]
-    ## Methodology
-    [Improved methodology addressing user feedback]
-    # ... (Other sections: Expected Outcomes, Potential Challenges, Required Skills, Broader Connections) ...
+    Create an improved version of the proposal sections (Background, Methodology, etc.) addressing the user's feedback, while maintaining scientific rigor and feasibility for the student profile ({self.student_profile['skill_level']}, {self.student_profile['time_frame']}, {self._resources_str}). The goal is to refine the approach for answering the **original Research Question**.
+
+    Respond with a single JSON object with the following keys, each holding the improved section as a string.
+    Do NOT include the Research Question; it stays exactly as it is.
+
+    {{
+      "title": "[A specific improved title - NOT a placeholder]",
+      "Background": "[Improved background addressing user feedback]",
+      "Methodology": "[Improved methodology addressing user feedback]",
+      "Expected Outcomes": "[Improved expected outcomes]",
+      "Potential Challenges": "[Improved potential challenges]",
+      "Required Skills": "[Improved required skills]",
+      "Broader Connections": "[Improved broader connections]"
+    }}
     """
 
-        improved_idea_text = self.llm_client.generate_content(improvement_prompt)
-
-        # --- Parse the improved idea (using similar logic as improve_idea) ---
-        temp_parsed_sections = {}
-        sections = [
-            "Research Question", "Background", "Methodology", "Expected Outcomes",
-            "Potential Challenges", "Required Skills", "Broader Connections"
-        ]
-        current_section = None
-        section_content = []
-
-        # Extract Title
-        title = ""
-        lines = improved_idea_text.split('\n')
-        for i, line in enumerate(lines):
-             if line.startswith('# ') and not line.lower().startswith('# research question'):
-                  title = line.replace('# ', '').strip()
-                  lines = lines[i+1:]
-                  break
-        if not title or title.startswith("[Create a specific improved title"): title = f"Improved: {self.current_idea['title']}"
-        self.current_idea['title'] = title
-
-        # Parse Sections
-        for line in lines:
-            stripped_line_lower = line.strip().lower()
-            found_section = False
-            for section_name in sections:
-                if stripped_line_lower == f'## {section_name.lower()}':
-                    if current_section and section_content:
-                        temp_parsed_sections[current_section] = '\n'.join(section_content).strip()
-                    current_section = section_name
-                    section_content = []
-                    found_section = True
-                    break
-            if not found_section and current_section is not None:
-                 section_content.append(line)
-
-        # Add last section
-        if current_section and section_content:
-            temp_parsed_sections[current_section] = '\n'.join(section_content).strip()
-
-        # Update self.current_idea['idea'] carefully, preserving original question
-        for section in sections:
-            if section == "Research Question":
-                self.current_idea['idea'][section] = original_research_question
-            elif section in temp_parsed_sections and temp_parsed_sections[section]:
-                self.current_idea['idea'][section] = temp_parsed_sections[section]
-            # else: keep existing content if LLM failed to generate
+        tier = "cheap" if len(user_feedback) < CHEAP_FEEDBACK_CHARS else "hard"
+        improved_sections = self._generate_improved_sections(improvement_prompt, tier=tier)
+        self._apply_improved_sections(improved_sections, original_research_question)
 
         self.current_idea["version"] = self.improvement_count
 
         return self.current_idea
 
+    def _compressed_section(self, section: str) -> str:
+        """Return a section of the current idea trimmed to SECTION_TOKEN_BUDGET, computed once per version."""
+        key = (self.current_idea.get("version", 0), section)
+        if key not in self._compressed_sections:
+            self._compressed_sections[key] = shrink_middle(
+                self.current_idea['idea'].get(section, ''), SECTION_TOKEN_BUDGET
+            )
+        return self._compressed_sections[key]
+
+    def _generate_improved_sections(self, improvement_prompt: str, tier: str = "hard") -> Optional[Dict[str, Any]]:
+        """Request the improved sections, returning None if the response cannot be parsed."""
+        try:
+            return self.llm_client.generate_json(improvement_prompt, schema=IMPROVED_PROPOSAL_SCHEMA, tier=tier)
+        except ValueError as e:
+            print(f"Error parsing improved proposal: {str(e)}")
+            return None
+
+    def _apply_improved_sections(self, improved_sections: Optional[Dict[str, Any]], original_research_question: str) -> None:
+        """Update self.current_idea with improved sections, preserving the original question."""
+        if improved_sections is None:
+            # Unparseable or truncated output; keep the proposal as it was
+            return
+        title = str(improved_sections.get("title", "")).strip()
+        if not title or title.startswith("[A specific improved title"):
+            title = f"Improved: {self.current_idea['title']}"
+        self.current_idea['title'] = title
+
+        # Always keep the original question from self.current_idea
+        self.current_idea['idea']["Research Question"] = original_research_question
+        for section in IMPROVED_SECTIONS:
+            content = improved_sections.get(section)
+            if content:
+                # Update with newly generated content if available
+                self.current_idea['idea'][section] = str(content).strip()
+            # else: keep the existing content if the LLM failed to generate it
+
 
 # Main execution block for testing
 if __name__ == "__main__":
@@ -1,29 +1,375 @@
 import os
 import re
 import json
+import time
+import threading
+import hashlib
+import unicodedata
 import asyncio
-import nest_asyncio
-import datetime
+import itertools
+import string
+import xml.etree.ElementTree as ET
 import requests
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
-from dateutil.relativedelta import relativedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from dataclasses import asdict, dataclass
+from pydantic import BaseModel, ValidationError, field_validator
 
 # Import the LLMClient wrapper
-from llm_client import LLMClient
+from llm_client import LLMClient, MODEL_TIERS, get_llm_client
+import embeddings
+from llm_cache import PROMPT_TEMPLATE_VERSION, SemanticCache, get_response_cache, get_semantic_cache, make_key
+from text_utils import estimate_tokens, truncate_tokens
 
-# Try to import Google's genai library for backward compatibility
+# aiohttp is optional; without it the async search falls back to requests in a thread
 try:
-    from google import genai
+    import aiohttp
 except ImportError:
-    genai = None
+    aiohttp = None
 
-# Apply nest_asyncio to allow nested event loops (needed for async arxiv search)
-nest_asyncio.apply()
+# orjson is optional; it parses search responses several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Both accept the raw response bytes, so the body is not decoded to str first
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Response schemas for the literature review. They are passed to the provider's JSON mode
+# and also validate the parsed response, so fields are read directly afterwards.
+class LiteratureReviewSchema(BaseModel):
+    novelty_score: float
+    novelty_assessment: str
+    differentiation_suggestions: List[str]
+    emerging_trends: str
+    summary: str
+
+    @field_validator("novelty_score", mode="before")
+    @classmethod
+    def _coerce_novelty_score(cls, value: Any) -> float:
+        # Providers without JSON mode may answer "8/10"; out-of-range scores become 0.0
+        return _parse_novelty_score(value)
+
+class LiteratureReviewBatchItem(LiteratureReviewSchema):
+    idea_number: int
+
+class LiteratureReviewBatchSchema(BaseModel):
+    reviews: List[LiteratureReviewBatchItem]
+
+# Static prompts. They contain no interpolated fields, so every call shares a
+# byte-identical prefix that the providers' prompt caching can reuse. The review
+# rubrics are sent as system prompts; the idea and papers go in the user turn.
+_QUERY_PROMPT_PREFIX = "Convert this research idea into 3-5 key search terms for academic paper search: "
+
+_REVIEW_SYSTEM_PROMPT = """
+You are an expert astronomy researcher tasked with evaluating the novelty of a student's research idea based on recently published papers.
+
+**Your Task:**
+Based *only* on the student's idea and the list of papers given in the user message, provide a comprehensive analysis. If no papers were found, assess the idea based on general domain knowledge.
+
+Your response MUST be a single JSON object with the following structure. Do not include any text outside of the JSON object.
+
+{
+  "novelty_score": [Provide a score from 1 (not novel) to 10 (highly novel). Base this on whether similar papers exist and how much the student's idea overlaps with them.],
+  "novelty_assessment": "[Provide a 2-3 sentence analysis explaining the novelty score. If similar papers exist, explain the overlap. If not, explain why the idea might be novel or hard to research.]",
+  "differentiation_suggestions": [
+    "[Suggest 2-3 concrete ways the student could differentiate their project from the existing literature. For example: 'Focus on a different class of objects,' 'Apply a more advanced analysis technique,' or 'Use a newer, more sensitive dataset.']"
+  ],
+  "emerging_trends": "[Based on the papers, briefly describe any emerging trends in this research area. If no papers, state that.]",
+  "summary": "[Provide a final 1-2 sentence summary of the literature review, concluding with a clear recommendation on whether to proceed, refine, or reconsider the idea.]"
+}
+"""
+
+_BATCH_REVIEW_SYSTEM_PROMPT = """
+You are an expert astronomy researcher tasked with evaluating the novelty of several students' research ideas based on recently published papers.
+
+**Your Task:**
+The ideas are listed in the user message, each numbered and followed by its own list of papers. Assess each idea independently and based *only* on its own papers.
+
+Your response MUST be a single JSON object of the form {"reviews": [...]}, with one review object per idea, in the order given. Each review object has these fields:
+- "idea_number": the number of the idea being reviewed.
+- "novelty_score": a score from 1 (not novel) to 10 (highly novel), based on whether similar papers exist and how much the idea overlaps with them.
+- "novelty_assessment": a 2-3 sentence analysis explaining the novelty score.
+- "differentiation_suggestions": 2-3 concrete ways the student could differentiate their project from the existing literature.
+- "emerging_trends": a brief description of any emerging trends in this research area.
+- "summary": a final 1-2 sentence summary, concluding with a clear recommendation on whether to proceed, refine, or reconsider the idea.
+"""
+
+# Variable tail of a review prompt: one idea and the papers found for it
+_IDEA_PROMPT_TEMPLATE = string.Template("""
+**Student's Research Idea:**
+- Title: $title
+- Research Question: $question
+- Proposed Methodology: $methodology
+
+**Relevant Recent Papers:**
+$papers_text
+""")
+
+# One paper in the papers_text slot above. Authors are left out: they do not bear on
+# novelty, and long author lists cost more tokens than the abstract
+_PAPER_PROMPT_TEMPLATE = "- {title} ({year}): {abstract}"
+
+# Tokens of each abstract included in a review prompt; the opening of an abstract
+# carries most of what matters for a novelty comparison
+ABSTRACT_PROMPT_TOKENS = 75
+# Token budget for the whole paper list of one idea; papers past it are left out
+PAPERS_PROMPT_TOKENS = 6000
+
+# Fingerprint of everything that shapes a prompt. It is part of every cache key and
+# semantic cache name, so editing a template retires the responses built from the old one
+_PROMPT_VERSION = make_key(
+    PROMPT_TEMPLATE_VERSION, _QUERY_PROMPT_PREFIX, _REVIEW_SYSTEM_PROMPT, _BATCH_REVIEW_SYSTEM_PROMPT,
+    _IDEA_PROMPT_TEMPLATE.template, _PAPER_PROMPT_TEMPLATE, ABSTRACT_PROMPT_TOKENS, PAPERS_PROMPT_TOKENS
+)[:16]
+
+# Review prompts whose variable part (idea plus papers, excluding the fixed system prompt)
+# is shorter than this, i.e. with very few papers, start on the cheap model tier
+CHEAP_REVIEW_PROMPT_CHARS = 2000
+# Novelty scores from the cheap tier in this range are re-evaluated on the hard tier
+AMBIGUOUS_NOVELTY_RANGE = (4.0, 7.0)
+# Upper bound on distinct terms kept from the LLM's keyword list; long term lists hurt
+# search precision and often return nothing
+MAX_SEARCH_TERMS = 6
+_SEARCH_TERM_SPLIT_RE = re.compile(r'[\n\r,;]')
+_LIST_MARKER_RE = re.compile(r'^\s*(?:[-*\u2022]|\d+[.)])\s*')
+
+# Queries of at most this many words are already keyword-like and skip the LLM rewrite
+MAX_LOCAL_QUERY_WORDS = 6
+# Longer queries are reduced to key phrases locally with KeyBERT; the LLM rewrite is only
+# used when that yields fewer phrases than this (or KeyBERT is not installed)
+MIN_LOCAL_KEYWORDS = 3
+
+SEMANTIC_SCHOLAR_SEARCH_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
+# Fields read by the review and the UI, plus the citation count that the MCP server's
+# similar_papers output exposes; abstracts are needed for every paper kept
+SEMANTIC_SCHOLAR_FIELDS = "title,abstract,authors,year,citationCount,url,paperId"
+ARXIV_QUERY_URL = "https://export.arxiv.org/api/query"
+_ATOM_NS = {"atom": "http://www.w3.org/2005/Atom", "opensearch": "http://a9.com/-/spec/opensearch/1.1/"}
+# arXiv occasionally serves an empty page for a query that has matches; such pages are
+# refetched this many times, waiting ARXIV_RETRY_DELAY seconds more on each attempt
+ARXIV_EMPTY_PAGE_RETRIES = 2
+ARXIV_RETRY_DELAY = 3
+# Timeout (seconds), connection cap and DNS cache lifetime (seconds) for the shared
+# async HTTP session
+SEARCH_TIMEOUT = 10
+SEARCH_CONNECTION_LIMIT = 20
+SEARCH_DNS_CACHE_TTL = 300
+# Rate-limit (429) and transient server errors are retried with exponential backoff,
+# by the adapter for sync searches and by _fetch_async for async ones
+SEARCH_RETRIES = 3
+SEARCH_RETRY_BACKOFF = 0.5
+SEARCH_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Request rate ceilings, as (requests, seconds): Semantic Scholar's shared public pool,
+# and arXiv's requested one call every three seconds
+SEMANTIC_SCHOLAR_RATE_LIMIT = (100, 60)
+ARXIV_RATE_LIMIT = (1, 3)
+# Module-wide HTTP session so sync searches from every agent reuse pooled connections
+_HTTP_SESSION = requests.Session()
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(total=SEARCH_RETRIES, backoff_factor=SEARCH_RETRY_BACKOFF, status_forcelist=SEARCH_RETRY_STATUSES)
+)
+_HTTP_SESSION.mount("https://", _HTTP_ADAPTER)
+_HTTP_SESSION.mount("http://", _HTTP_ADAPTER)
+
+# Search results for a query are stable over hours, so they are cached on disk for a day
+SEARCH_CACHE_TTL = 24 * 60 * 60
+# Keyword rewrites of a research question do not go stale, so they are kept for a month
+QUERY_CACHE_TTL = 30 * 24 * 60 * 60
+# Finished reviews are reused for a day when the same idea meets the same set of papers
+FEEDBACK_CACHE_TTL = 24 * 60 * 60
+
+# Cosine similarity between the research question and its closest paper abstract below
+# which the idea is taken to be clearly novel, and above which clearly covered already;
+# in both regimes the LLM review is skipped
+NOVELTY_SHORTCUT_LOW_SIMILARITY = 0.35
+NOVELTY_SHORTCUT_HIGH_SIMILARITY = 0.85
+# Without an embedding model, a handful of papers whose titles and abstracts contain less
+# than this fraction of the research question's content words are not sent for review.
+# Word overlap misses synonyms and acronyms, so this yields a "not assessed" review rather
+# than a novelty claim
+MAX_LEXICAL_SHORTCUT_PAPERS = 2
+MIN_TEXT_OVERLAP = 0.2
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_STOPWORDS = frozenset(
+    "the and for with from into using use via its their this that what how can does are our "
+    "new study analysis data based toward towards between".split()
+)
+
+# Upper bound on literature reviews in flight at once, to stay within API rate limits
+MAX_CONCURRENT_REVIEWS = 8
+
+# Runs of punctuation and whitespace, dropped when comparing titles across sources
+_TITLE_NOISE_RE = re.compile(r'[\W_]+')
+
+# Matches "8", "7.5", "8/10" or "Score: 7.5" without picking up digits from years like "2024"
+_NOVELTY_SCORE_RE = re.compile(r'(?:score[:\s]*|^)\s*(10|[1-9](?:\.\d+)?)(?!\d)(?:\s*/\s*10)?', re.IGNORECASE | re.MULTILINE)
+
+class _RateLimiter:
+    """Spaces requests evenly so at most `requests` start in any `seconds` window.
+
+    Shared by every agent in the process and by both the sync and async searches:
+    reserve() books the next free slot and returns how long to wait for it.
+    """
+
+    def __init__(self, requests: int, seconds: float):
+        self._interval = seconds / requests
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+            return slot - now
 
-@dataclass
+    def wait(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+# Deletes the quote characters the search APIs choke on, in one pass
+_QUOTE_DELETE_TABLE = str.maketrans("", "", "\"'")
+
+_SEMANTIC_SCHOLAR_LIMITER = _RateLimiter(*SEMANTIC_SCHOLAR_RATE_LIMIT)
+_ARXIV_LIMITER = _RateLimiter(*ARXIV_RATE_LIMIT)
+
+def _semantic_scholar_params(query: str, limit: int) -> Dict[str, Any]:
+    """Build Semantic Scholar search parameters, stripping quotes the API chokes on."""
+    return {
+        'query': query.translate(_QUOTE_DELETE_TABLE).strip(),
+        'limit': min(limit, 100),  # API limit is 100
+        'fields': SEMANTIC_SCHOLAR_FIELDS
+    }
+
+def _search_cache_key(query: str, limit: int, source: str = "semantic_scholar") -> str:
+    # The field list is part of the key so results cached with a different paper shape are not reused
+    return make_key(source, SEMANTIC_SCHOLAR_FIELDS, limit, query)
+
+def _parse_semantic_scholar_papers(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Convert a Semantic Scholar search response into paper dicts, keeping only papers with abstracts."""
+    # Single pass; each abstract is looked up once for both the filter and the value.
+    # Abstracts often carry hard line breaks and runs of spaces, which only cost prompt tokens.
+    return [
+        {
+            'title': paper.get('title', 'Unknown Title'),
+            'abstract': ' '.join(abstract.split()),
+            'authors': [author.get('name', 'Unknown') for author in paper.get('authors', [])],
+            'year': paper.get('year', 'Unknown'),
+            'citation_count': paper.get('citationCount', 0),
+            'url': paper.get('url', ''),
+            'paper_id': paper.get('paperId', '')
+        }
+        for paper in data.get('data') or []
+        if (abstract := paper.get('abstract'))
+    ]
+
+def _arxiv_params(query: str, limit: int) -> Dict[str, Any]:
+    """Build arXiv API search parameters for a relevance-ranked search over all fields.
+
+    Only a single page is requested, capped at 100 results, since larger pages are slow
+    and prone to stalling.
+    """
+    return {
+        'search_query': "all:" + query.translate(_QUOTE_DELETE_TABLE).strip(),
+        'start': 0,
+        'max_results': min(limit, 100),
+        'sortBy': 'relevance'
+    }
+
+def _parse_arxiv_papers(feed: str) -> Tuple[List[Dict[str, Any]], bool]:
+    """Convert an arXiv Atom feed into paper dicts shaped like the Semantic Scholar ones.
+
+    Also returns whether the page is unexpectedly empty, i.e. has no entries although
+    the feed reports matching results.
+    """
+    root = ET.fromstring(feed)
+    entries = root.findall('atom:entry', _ATOM_NS)
+    total_results = root.findtext('opensearch:totalResults', '0', _ATOM_NS).strip()
+    if not entries:
+        return [], total_results.isdigit() and int(total_results) > 0
+
+    papers = []
+    for entry in entries:
+        abstract = entry.findtext('atom:summary', '', _ATOM_NS)
+        if not abstract.strip():
+            continue
+        url = entry.findtext('atom:id', '', _ATOM_NS).strip()
+        published = entry.findtext('atom:published', '', _ATOM_NS)
+        papers.append({
+            'title': ' '.join(entry.findtext('atom:title', 'Unknown Title', _ATOM_NS).split()),
+            'abstract': ' '.join(abstract.split()),
+            'authors': [author.findtext('atom:name', 'Unknown', _ATOM_NS) for author in entry.iterfind('atom:author', _ATOM_NS)],
+            'year': int(published[:4]) if published[:4].isdigit() else 'Unknown',
+            'citation_count': 0,  # not reported by arXiv
+            'url': url,
+            'paper_id': 'arXiv:' + url.rsplit('/abs/', 1)[-1]
+        })
+    return papers, False
+
+def _content_words(text: str) -> set:
+    """Lowercased words of three or more characters, minus common filler words."""
+    return {word for word in _WORD_RE.findall(text.lower()) if len(word) > 2 and word not in _STOPWORDS}
+
+def _normalize_cache_text(text: str) -> str:
+    """Lowercase text and collapse its whitespace, so trivially different requests share a cache key."""
+    return " ".join(text.lower().split())
+
+def _title_key(title: str) -> str:
+    """Normalize a title for duplicate detection, ignoring case, accents, punctuation and spacing."""
+    decomposed = unicodedata.normalize('NFKD', title)
+    return _TITLE_NOISE_RE.sub('', ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold())
+
+def _merge_papers(*sources: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    """Interleave the result lists of several sources, dropping papers seen under the same title."""
+    merged = {}
+    for paper in itertools.chain.from_iterable(itertools.zip_longest(*sources)):
+        if paper is not None:
+            merged.setdefault(_title_key(paper['title']), paper)
+    return list(merged.values())[:limit]
+
+def _normalize_search_terms(text: str) -> str:
+    """Turn the LLM's keyword list into a short, deduplicated search query.
+
+    Handles comma- or line-separated lists with bullets, numbering, quotes and an
+    introductory "Here are the terms:" line; falls back to the stripped text.
+    """
+    terms, seen = [], set()
+    for raw_term in _SEARCH_TERM_SPLIT_RE.split(text):
+        if raw_term.rstrip().endswith(':'):
+            continue
+        term = _LIST_MARKER_RE.sub('', raw_term).strip(" .,;:'\"*")
+        term_key = term.lower()
+        if term and term_key not in seen:
+            seen.add(term_key)
+            terms.append(term)
+    return " ".join(terms[:MAX_SEARCH_TERMS]) or text.strip()
+
+def _parse_novelty_score(value: Any, default: float = 0.0) -> float:
+    """Coerce the model's novelty score into a float in [1, 10]."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        score = float(value)
+    else:
+        match = _NOVELTY_SCORE_RE.search(str(value).strip())
+        if not match:
+            return default
+        score = float(match.group(1))
+    return score if 1.0 <= score <= 10.0 else default
+
+@dataclass(slots=True, frozen=True)
 class LiteratureFeedback:
-    """Structured feedback from literature review"""
+    """Structured feedback from literature review (immutable; serialize with dataclasses.asdict)"""
     similar_papers: List[Dict[str, str]]
     novelty_assessment: str
     differentiation_suggestions: List[str]
@@ -47,66 +393,135 @@ class LiteratureAgent:
         self.api_key = api_key
         self.provider = provider
         self.temperature = temperature
-        try:
-            self.llm_client = LLMClient(self.api_key, self.provider, self.temperature)
-        except ValueError as e:
-            raise ValueError(f"Error initializing LiteratureAgent's LLM client: {str(e)}")
+        # Validate the provider now, but defer creating the SDK client until the first LLM call
+        if provider not in MODEL_TIERS:
+            raise ValueError(f"Error initializing LiteratureAgent's LLM client: Unsupported provider: {provider}")
+        self._llm_client = None
+        # Empty results are not cached, since failed requests also come back empty
+        self._search_cache = get_response_cache("semantic_scholar", SEARCH_CACHE_TTL)
+        # (etag, papers) per search, kept past the TTL so expired entries can be revalidated
+        self._search_etags = get_response_cache("semantic_scholar_etags")
+        self._feedback_cache = get_response_cache("literature_feedback", FEEDBACK_CACHE_TTL)
+        # Abstract embeddings per paper, shared by every search that returns the same paper
+        self._paper_embeddings = get_response_cache("paper_embeddings")
+        self._simplified_queries = {}  # blake2b digest of the query -> simplified query
+        self._session = None  # aiohttp session, created on first async search
+        self._session_loop = None
+
+    @property
+    def llm_client(self) -> LLMClient:
+        """The LLM client, created on first use."""
+        if self._llm_client is None:
+            self._llm_client = get_llm_client(self.api_key, self.provider, self.temperature)
+        return self._llm_client
+
+    def _result_cache(self, max_papers: int, model_tier: Optional[str]) -> SemanticCache:
+        """Finished reviews keyed by the embedding of their research question, so a paraphrased
+        question skips both the paper search and the LLM review.
+
+        One cache per provider, paper count and tier, so a request for more papers or a
+        forced tier is never answered with a review produced under other settings. Entries
+        expire with the reviews they hold, so recent papers are searched for again.
+        """
+        return get_semantic_cache(
+            f"literature_result-{_PROMPT_VERSION}-{self.provider}-{max_papers}-{model_tier or 'auto'}",
+            FEEDBACK_CACHE_TTL
+        )
+
+    def _cached_generate(self, kind: str, prompt: str, generate: Callable[[], Any], semantic_text: Optional[str] = None, ttl: Optional[float] = None) -> Any:
+        """Return a cached LLM response for this prompt, calling generate() only on a miss.
+
+        Lookups go to an exact-match cache keyed on the full prompt text first, then (when
+        semantic_text is given) to a semantic cache so near-duplicate ideas reuse a response.
+        Entries in both caches expire after ttl seconds (never, by default). The key ignores
+        case and whitespace differences; the prompt itself is sent unchanged.
+        """
+        key = make_key(kind, self.provider, self.temperature, _PROMPT_VERSION, _normalize_cache_text(prompt))
+        exact_cache = get_response_cache(f"literature_{kind}")
+        # Loaded only when used, since loading reads its file and registers a save at exit
+        semantic_cache = get_semantic_cache(f"literature_{kind}-{_PROMPT_VERSION}", ttl) if semantic_text else None
+
+        cached = exact_cache.get(key)
+        if cached is None and semantic_cache is not None:
+            cached = semantic_cache.lookup(semantic_text)
+        if cached is not None:
+            return cached
+
+        result = generate()
+        exact_cache.set(key, result, ttl)
+        if semantic_cache is not None:
+            semantic_cache.add(semantic_text, result)
+        return result
     
     def simplify_query_with_llm(self, query: str) -> str:
-        """Use the LLM to simplify and improve the search query."""
-        try:
-            # print("Simplifying query with LLM...")
-            simplified_query = self.llm_client.generate(
-                f"Convert this research idea into 3-5 key search terms for academic paper search: {query}"
-            )
-            # print(f"Simplified query: {simplified_query}")
-            return simplified_query.strip()
-        except Exception as e:
-            # print(f"Error simplifying query with LLM: {e}. Falling back to original query.")
-            return query
+        """Use the LLM to simplify and improve the search query.
+
+        Results are memoized per query, so re-reviewing an unchanged idea during
+        refinement reuses them, and persisted for a month so later sessions skip the
+        LLM call too. Short keyword-like queries are used as-is, and longer ones go
+        through the local keyword extractor before falling back to the LLM.
+        """
+        query_key = hashlib.blake2b(_normalize_cache_text(query).encode("utf-8"), digest_size=16).hexdigest()
+        if query_key in self._simplified_queries:
+            return self._simplified_queries[query_key]
+
+        is_short = len(query.split()) <= MAX_LOCAL_QUERY_WORDS
+        keywords = None
+        if not is_short:
+            try:
+                keywords = embeddings.extract_keywords(query, top_n=MAX_SEARCH_TERMS)
+            except Exception as e:
+                # KeyBERT or its model failed to load; the LLM rewrite below takes over
+                print(f"Error extracting keywords locally: {str(e)}")
+
+        if is_short:
+            simplified_query = query.strip()
+        elif keywords and len(keywords) >= MIN_LOCAL_KEYWORDS:
+            simplified_query = _normalize_search_terms(", ".join(keywords))
+        else:
+            try:
+                # print("Simplifying query with LLM...")
+                # Keyword extraction is mechanical, so it goes to the cheap model tier
+                prompt = _QUERY_PROMPT_PREFIX + query
+                simplified_query = _normalize_search_terms(self._cached_generate(
+                    "query", prompt, lambda: self.llm_client.generate(prompt, tier="cheap"),
+                    semantic_text=query, ttl=QUERY_CACHE_TTL
+                ))
+                # print(f"Simplified query: {simplified_query}")
+            except Exception as e:
+                # print(f"Error simplifying query with LLM: {e}. Falling back to original query.")
+                # Not memoized, so a transient failure is retried next time
+                return query
+
+        self._simplified_queries[query_key] = simplified_query
+        return simplified_query
     
     def search_semantic_scholar(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
         """Search Semantic Scholar using their API."""
         # print(f"Searching Semantic Scholar via direct API for: {query}")
         
-        # Clean and prepare the query
-        # Remove quotes and clean up the query for the API
-        clean_query = query.replace('"', '').replace("'", "").strip()
-        
-        # Semantic Scholar API endpoint
-        url = "https://api.semanticscholar.org/graph/v1/paper/search"
-        
-        # Parameters for the search
-        params = {
-            'query': clean_query,
-            'limit': min(limit, 100),  # API limit is 100
-            'fields': 'title,abstract,authors,year,citationCount,url,paperId'
-        }
-        
+        cache_key = _search_cache_key(query, limit)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        validator = self._search_etags.get(cache_key)
         try:
             # print(f"Querying Semantic Scholar API with a 30-second timeout...")
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            # print("Search complete. Processing results...")
-            data = response.json()
-            
-            papers = []
-            if 'data' in data and data['data']:
-                for paper in data['data']:
-                    # Only include papers with abstracts
-                    if paper.get('abstract'):
-                        papers.append({
-                            'title': paper.get('title', 'Unknown Title'),
-                            'abstract': paper.get('abstract', 'No abstract available'),
-                            'authors': [author.get('name', 'Unknown') for author in paper.get('authors', [])],
-                            'year': paper.get('year', 'Unknown'),
-                            'citation_count': paper.get('citationCount', 0),
-                            'url': paper.get('url', ''),
-                            'paper_id': paper.get('paperId', '')
-                        })
-            
+            _SEMANTIC_SCHOLAR_LIMITER.wait()
+            response = _HTTP_SESSION.get(
+                SEMANTIC_SCHOLAR_SEARCH_URL,
+                params=_semantic_scholar_params(query, limit),
+                headers={"If-None-Match": validator[0]} if validator else None,
+                timeout=30
+            )
+            if response.status_code == 304 and validator:
+                papers = validator[1]
+            else:
+                response.raise_for_status()
+                papers = _parse_semantic_scholar_papers(_json_loads(response.content))
             # print(f"Found {len(papers)} papers on Semantic Scholar.")
+            self._store_search_result(cache_key, papers, response.headers.get("ETag"))
             return papers
             
         except requests.exceptions.RequestException as e:
@@ -116,89 +531,446 @@ class LiteratureAgent:
             # print(f"An error occurred during Semantic Scholar search: {e}")
             return []
 
-    def run_literature_search(self, research_idea: Dict[str, Any], max_papers: int = 10) -> LiteratureFeedback:
+    async def search_semantic_scholar_async(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Search Semantic Scholar without blocking the event loop.
+
+        Uses one pooled aiohttp session per agent, so repeated searches reuse connections.
         """
-        Searches Semantic Scholar for relevant papers and generates a literature review.
+        if aiohttp is None:
+            return await asyncio.to_thread(self.search_semantic_scholar, query, limit)
+
+        cache_key = _search_cache_key(query, limit)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        validator = self._search_etags.get(cache_key)
+        try:
+            status, body, etag = await self._fetch_async(
+                SEMANTIC_SCHOLAR_SEARCH_URL,
+                _semantic_scholar_params(query, limit),
+                _SEMANTIC_SCHOLAR_LIMITER,
+                headers={"If-None-Match": validator[0]} if validator else None
+            )
+            if status == 304 and validator:
+                papers = validator[1]
+            else:
+                papers = _parse_semantic_scholar_papers(_json_loads(body))
+            self._store_search_result(cache_key, papers, etag)
+            return papers
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return []
+        except Exception:
+            return []
+
+    def search_arxiv(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Search arXiv using its Atom API."""
+        cache_key = _search_cache_key(query, limit, "arxiv")
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        try:
+            for attempt in range(ARXIV_EMPTY_PAGE_RETRIES + 1):
+                if attempt:
+                    time.sleep(ARXIV_RETRY_DELAY * attempt)
+                _ARXIV_LIMITER.wait()
+                response = _HTTP_SESSION.get(ARXIV_QUERY_URL, params=_arxiv_params(query, limit), timeout=30)
+                response.raise_for_status()
+                papers, empty_page = _parse_arxiv_papers(response.text)
+                if not empty_page:
+                    break
+            self._store_search_result(cache_key, papers, None)
+            return papers
+        except (requests.exceptions.RequestException, ET.ParseError):
+            return []
+
+    async def search_arxiv_async(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Search arXiv without blocking the event loop."""
+        if aiohttp is None:
+            return await asyncio.to_thread(self.search_arxiv, query, limit)
+
+        cache_key = _search_cache_key(query, limit, "arxiv")
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        try:
+            for attempt in range(ARXIV_EMPTY_PAGE_RETRIES + 1):
+                if attempt:
+                    await asyncio.sleep(ARXIV_RETRY_DELAY * attempt)
+                _, body, _ = await self._fetch_async(ARXIV_QUERY_URL, _arxiv_params(query, limit), _ARXIV_LIMITER)
+                papers, empty_page = _parse_arxiv_papers(body.decode("utf-8", errors="replace"))
+                if not empty_page:
+                    break
+            self._store_search_result(cache_key, papers, None)
+            return papers
+        except (aiohttp.ClientError, asyncio.TimeoutError, ET.ParseError):
+            return []
+
+    def search_papers(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Search Semantic Scholar and arXiv concurrently and merge the results."""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            semantic_scholar = executor.submit(self.search_semantic_scholar, query, limit)
+            arxiv = executor.submit(self.search_arxiv, query, limit)
+            return _merge_papers(semantic_scholar.result(), arxiv.result(), limit=limit)
+
+    async def search_papers_async(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Async variant of search_papers."""
+        semantic_scholar, arxiv = await asyncio.gather(
+            self.search_semantic_scholar_async(query, limit), self.search_arxiv_async(query, limit)
+        )
+        return _merge_papers(semantic_scholar, arxiv, limit=limit)
+
+    def _store_search_result(self, cache_key: str, papers: List[Dict[str, Any]], etag: Optional[str]) -> None:
+        """Cache non-empty search results, keeping the ETag for a later conditional request."""
+        if not papers:
+            return
+        self._search_cache.set(cache_key, papers)
+        if etag:
+            self._search_etags.set(cache_key, (etag, papers))
+
+    async def _fetch_async(self, url: str, params: Dict[str, Any], limiter: _RateLimiter, headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes, Optional[str]]:
+        """GET url on the shared session, returning (status, body, ETag).
+
+        Every attempt waits for a slot from the source's rate limiter. Retryable statuses
+        are retried with exponential backoff, like the sync adapter; other error statuses
+        raise aiohttp.ClientResponseError.
         """
-        if not isinstance(research_idea, dict):
-            raise ValueError("research_idea must be a dictionary.")
+        for attempt in range(SEARCH_RETRIES + 1):
+            await limiter.wait_async()
+            async with self._get_session().get(url, params=params, headers=headers) as response:
+                if response.status not in SEARCH_RETRY_STATUSES or attempt == SEARCH_RETRIES:
+                    response.raise_for_status()
+                    return response.status, await response.read(), response.headers.get("ETag")
+            await asyncio.sleep(SEARCH_RETRY_BACKOFF * 2 ** attempt)
 
-        title = research_idea.get("title", "")
-        idea_details = research_idea.get("idea", {})
-        original_query = idea_details.get("Research Question", "") or title
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Return the shared aiohttp session, creating it inside the running event loop."""
+        # Sessions are bound to the loop they were created in, and callers such as
+        # asyncio.run() may use a fresh loop per call
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            if self._session is not None and not self._session.closed:
+                self._release_session(self._session, self._session_loop)
+            self._session_loop = loop
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=SEARCH_CONNECTION_LIMIT, ttl_dns_cache=SEARCH_DNS_CACHE_TTL),
+                timeout=aiohttp.ClientTimeout(total=SEARCH_TIMEOUT)
+            )
+        return self._session
+
+    @staticmethod
+    def _release_session(session: "aiohttp.ClientSession", loop: asyncio.AbstractEventLoop) -> None:
+        """Dispose of a session left behind on another event loop."""
+        if loop.is_running():
+            # Still serving another thread, so close it there
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            # Its loop has finished, so the close can no longer be awaited; detach the
+            # connector so the session counts as closed and its sockets go with it
+            session.detach()
 
+    async def close(self) -> None:
+        """Close the async HTTP session, if one was opened."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def run_literature_search(self, research_idea: Dict[str, Any], max_papers: int = 10, model_tier: Optional[str] = None) -> LiteratureFeedback:
+        """
+        Searches Semantic Scholar and arXiv for relevant papers and generates a literature review.
+
+        Short review prompts (few papers) go to the cheap model tier and are escalated to
+        the hard tier when the score lands in the ambiguous middle range. Pass model_tier
+        ('hard' or 'cheap') to force a tier.
+        """
+        original_query = self._original_query(research_idea)
         if not original_query:
             return self._create_basic_review([])
+        cached_feedback = self._result_cache(max_papers, model_tier).lookup(original_query)
+        if cached_feedback is not None:
+            return cached_feedback
         
         # Simplify the query for better API results
         search_query = self.simplify_query_with_llm(original_query)
 
-        # Run Semantic Scholar Search
-        all_papers = self.search_semantic_scholar(search_query, max_papers)
-        
-        # Analyze results
+        # Both sources are queried at once, so the wait is that of the slower one
+        all_papers = self.search_papers(search_query, max_papers)
+        return self._review_papers(research_idea, all_papers, max_papers, model_tier)
+
+    def _original_query(self, research_idea: Dict[str, Any]) -> str:
+        """Pick the text to search with: the research question, falling back to the title."""
+        if not isinstance(research_idea, dict):
+            raise ValueError("research_idea must be a dictionary.")
+        return research_idea.get("idea", {}).get("Research Question", "") or research_idea.get("title", "")
+
+    def _review_papers(self, research_idea: Dict[str, Any], all_papers: List[Dict[str, Any]], max_papers: int, model_tier: Optional[str]) -> LiteratureFeedback:
+        """Generate the LLM literature review of the papers found for an idea."""
+        idea_details = research_idea.get("idea", {})
+
+        # Analyze results; with no papers there is nothing for the LLM to compare against,
+        # so skip the review call and return the fallback directly
         if not all_papers:
             # print("No papers found from any source.")
-            return LiteratureFeedback(similar_papers=[], novelty_assessment="Could not generate an AI-powered analysis. Review the papers manually.", differentiation_suggestions=["Consider refining your search terms to find more relevant literature."], emerging_trends="Not available.", novelty_score=0.0, recommended_improvements=[], summary="Automated literature analysis failed.")
+            return self._create_basic_review(all_papers)
         
         # print(f"Total papers found: {len(all_papers)}. Starting literature review...")
-        
-        # Prepare paper information for LLM
-        papers_info = []
+
+        # Keyed on the idea fields and the set of paper ids, so a re-ranked but otherwise
+        # identical search result still hits
+        feedback_key = make_key(
+            "literature_feedback", _PROMPT_VERSION, self.provider, self.temperature, model_tier, max_papers,
+            research_idea.get('title', ''), idea_details.get('Research Question', ''), idea_details.get('Methodology', ''),
+            *sorted(paper.get('paper_id', '') for paper in all_papers)
+        )
+        cached_feedback = self._feedback_cache.get(feedback_key)
+        if cached_feedback is not None:
+            return LiteratureFeedback(**cached_feedback)
+
+        # With no forced tier, ideas far from (or nearly identical to) every paper found are
+        # scored from embedding similarity alone
+        if model_tier is None:
+            try:
+                shortcut_feedback = self._novelty_shortcut(research_idea, all_papers)
+            except Exception as e:
+                # e.g. the embedding model is installed but cannot be loaded; the LLM review still works
+                print(f"Error computing novelty shortcut: {str(e)}")
+                shortcut_feedback = None
+            if shortcut_feedback is not None:
+                return shortcut_feedback
+
+        # Only the idea and papers vary between calls; they go after the static prefix
+        prompt = self._idea_prompt_block(research_idea, all_papers, max_papers)
+
+        def generate_review() -> Dict[str, Any]:
+            # JSON mode constrains the output to the schema, so no free-form parsing is needed
+            tier = model_tier or ("cheap" if len(prompt) < CHEAP_REVIEW_PROMPT_CHARS else "hard")
+            review_json = self.llm_client.generate_json(prompt, schema=LiteratureReviewSchema, tier=tier, system=_REVIEW_SYSTEM_PROMPT)
+            if model_tier is None and tier == "cheap":
+                # Mid-range scores are where nuance matters, so let the stronger model decide
+                cheap_score = _parse_novelty_score(review_json.get("novelty_score"))
+                if AMBIGUOUS_NOVELTY_RANGE[0] <= cheap_score <= AMBIGUOUS_NOVELTY_RANGE[1]:
+                    review_json = self.llm_client.generate_json(prompt, schema=LiteratureReviewSchema, tier="hard", system=_REVIEW_SYSTEM_PROMPT)
+            return review_json
+
+        try:
+            # Not cached separately: the feedback cache above is keyed on the same idea fields
+            # and papers, and a semantic match would pair a review with papers it never saw
+            review_json = generate_review()
+            feedback = self._feedback_from_review(all_papers, LiteratureReviewSchema.model_validate(review_json))
+            self._feedback_cache.set(feedback_key, asdict(feedback))
+            # Fallback reviews are never stored, so a failed review is retried next time
+            self._result_cache(max_papers, model_tier).add(self._original_query(research_idea), feedback)
+            return feedback
+        except Exception as e:
+            print(f"Error parsing literature review: {str(e)}")
+            return self._create_basic_review(all_papers)
+
+    def _novelty_shortcut(self, research_idea: Dict[str, Any], all_papers: List[Dict[str, Any]]) -> Optional[LiteratureFeedback]:
+        """Return templated feedback when similarity alone settles the novelty question.
+
+        Returns None (so the LLM review runs) when the closest paper falls between the two
+        similarity thresholds. Without an embedding model, at most a couple of papers that
+        share almost no words with the question get a neutral, unassessed review instead.
+        """
+        question = self._original_query(research_idea)
+        question_vectors = embeddings.encode([question])
+        paper_vectors = embeddings.encode_cached(
+            [paper['abstract'] for paper in all_papers],
+            [make_key(embeddings.EMBEDDING_MODEL_NAME, paper['paper_id']) if paper.get('paper_id') else None for paper in all_papers],
+            self._paper_embeddings
+        )
+        if question_vectors is None or paper_vectors is None:
+            if len(all_papers) > MAX_LEXICAL_SHORTCUT_PAPERS:
+                return None
+            question_words = _content_words(question)
+            if not question_words:
+                return None
+            best_overlap = max(
+                len(question_words & _content_words(f"{paper['title']} {paper['abstract']}")) / len(question_words)
+                for paper in all_papers
+            )
+            if best_overlap < MIN_TEXT_OVERLAP:
+                return self._unassessed_papers_feedback(all_papers)
+            return None
+
+        similarities = paper_vectors @ question_vectors[0]
+        best_similarity = float(similarities.max())
+
+        if best_similarity < NOVELTY_SHORTCUT_LOW_SIMILARITY:
+            return self._unrelated_papers_feedback(all_papers, f"highest similarity {best_similarity:.2f}")
+
+        if best_similarity > NOVELTY_SHORTCUT_HIGH_SIMILARITY:
+            # Partial sort: only the three closest papers need to be found and ordered
+            top_positions = similarities.argpartition(-3)[-3:] if len(similarities) > 3 else range(len(similarities))
+            closest = [all_papers[position] for position in sorted(top_positions, key=lambda position: -similarities[position])]
+            return LiteratureFeedback(
+                similar_papers=all_papers,
+                novelty_score=2.0,
+                novelty_assessment=(
+                    "Recent papers address very nearly the same question: "
+                    + "; ".join(f"\"{paper['title']}\" ({paper['year']})" for paper in closest) + "."
+                ),
+                differentiation_suggestions=[
+                    "Read the closest papers and identify a question they leave open.",
+                    "Consider a different class of objects, a newer dataset, or a different analysis technique."
+                ],
+                emerging_trends="Not assessed; the closest papers already cover this question.",
+                summary="The idea closely overlaps existing work; reconsider or substantially refine it.",
+                recommended_improvements=[]
+            )
+        return None
+
+    def _unrelated_papers_feedback(self, all_papers: List[Dict[str, Any]], evidence: str) -> LiteratureFeedback:
+        """Templated feedback for a search whose papers are all far from the research question."""
+        return LiteratureFeedback(
+            similar_papers=all_papers,
+            novelty_score=9.0,
+            novelty_assessment=(
+                f"None of the {len(all_papers)} recent papers found is closely related to the research question "
+                f"({evidence}), which suggests the idea is largely unexplored."
+            ),
+            differentiation_suggestions=[
+                "Check adjacent subfields for related methods, since no direct overlap was found.",
+                "Make sure the data and tools the idea relies on are available."
+            ],
+            emerging_trends="Not assessed; no closely related papers were found.",
+            summary="No close matches were found in the recent literature; proceed with the idea.",
+            recommended_improvements=[]
+        )
+
+    def _unassessed_papers_feedback(self, all_papers: List[Dict[str, Any]]) -> LiteratureFeedback:
+        """Neutral feedback for a small search whose papers look off-topic by word overlap alone."""
+        return LiteratureFeedback(
+            similar_papers=all_papers,
+            novelty_score=0.0,
+            novelty_assessment=(
+                f"Not assessed: the {len(all_papers)} paper(s) found share few words with the research question "
+                "and may simply be off-topic results, so no novelty judgement was made."
+            ),
+            differentiation_suggestions=["Refine the search terms, including synonyms and instrument names, and search again."],
+            emerging_trends="Not assessed.",
+            summary="The search returned too little related literature to assess novelty; review the field manually.",
+            recommended_improvements=[]
+        )
+
+    def _idea_prompt_block(self, research_idea: Dict[str, Any], all_papers: List[Dict[str, Any]], max_papers: int) -> str:
+        """Format an idea and its papers as the variable tail of a review prompt."""
+        # Prepare paper information for LLM, packing papers until the token budget is spent
+        papers_info, budget = [], PAPERS_PROMPT_TOKENS
         for paper in all_papers[:max_papers]:  # Limit for prompt size
-            papers_info.append(
-                f"- Title: {paper['title']}\n"
-                f"  Authors: {', '.join(paper['authors'])}\n"
-                f"  Year: {paper['year']}\n"
-                f"  Abstract: {paper['abstract'][:500]}...\n" # Truncate for prompt
+            paper_info = _PAPER_PROMPT_TEMPLATE.format(
+                title=paper['title'],
+                year=paper['year'],
+                abstract=truncate_tokens(paper['abstract'], ABSTRACT_PROMPT_TOKENS)
             )
+            budget -= estimate_tokens(paper_info)
+            if budget < 0:
+                break
+            papers_info.append(paper_info)
         
         papers_text = "\n".join(papers_info) if papers_info else "No relevant papers were found in the initial search."
 
-        prompt = f"""
-You are an expert astronomy researcher tasked with evaluating the novelty of a student's research idea based on recently published papers.
+        idea_details = research_idea.get('idea', {})
+        return _IDEA_PROMPT_TEMPLATE.substitute(
+            title=research_idea.get('title', 'N/A'),
+            question=idea_details.get('Research Question', 'N/A'),
+            methodology=idea_details.get('Methodology', 'N/A'),
+            papers_text=papers_text
+        )
 
-**Student's Research Idea:**
-- Title: {research_idea.get('title', 'N/A')}
-- Research Question: {research_idea.get('idea', {}).get('Research Question', 'N/A')}
-- Proposed Methodology: {research_idea.get('idea', {}).get('Methodology', 'N/A')}
+    def _feedback_from_review(self, all_papers: List[Dict[str, Any]], review: LiteratureReviewSchema) -> LiteratureFeedback:
+        """Combine a validated review with the paper details into the final feedback object."""
+        return LiteratureFeedback(
+            similar_papers=all_papers,
+            novelty_score=review.novelty_score,
+            novelty_assessment=review.novelty_assessment,
+            differentiation_suggestions=review.differentiation_suggestions,
+            emerging_trends=review.emerging_trends,
+            summary=review.summary,
+            recommended_improvements=[] # This field can be deprecated or kept for compatibility
+        )
 
-**Relevant Recent Papers:**
-{papers_text}
+    async def run_literature_search_async(self, research_idea: Dict[str, Any], max_papers: int = 10, model_tier: Optional[str] = None) -> LiteratureFeedback:
+        """Async variant of run_literature_search.
 
-**Your Task:**
-Based *only* on the student's idea and the provided list of papers, provide a comprehensive analysis. If no papers were found, assess the idea based on general domain knowledge.
+        The paper search runs on the event loop; the blocking LLM calls run in worker threads.
+        """
+        original_query = self._original_query(research_idea)
+        if not original_query:
+            return self._create_basic_review([])
+        cached_feedback = await asyncio.to_thread(self._result_cache(max_papers, model_tier).lookup, original_query)
+        if cached_feedback is not None:
+            return cached_feedback
 
-Your response MUST be a single JSON object with the following structure. Do not include any text outside of the JSON object.
+        search_query = await asyncio.to_thread(self.simplify_query_with_llm, original_query)
+        all_papers = await self.search_papers_async(search_query, max_papers)
+        return await asyncio.to_thread(self._review_papers, research_idea, all_papers, max_papers, model_tier)
 
-{{
-  "novelty_score": [Provide a score from 1 (not novel) to 10 (highly novel). Base this on whether similar papers exist and how much the student's idea overlaps with them.],
-  "novelty_assessment": "[Provide a 2-3 sentence analysis explaining the novelty score. If similar papers exist, explain the overlap. If not, explain why the idea might be novel or hard to research.]",
-  "differentiation_suggestions": [
-    "[Suggest 2-3 concrete ways the student could differentiate their project from the existing literature. For example: 'Focus on a different class of objects,' 'Apply a more advanced analysis technique,' or 'Use a newer, more sensitive dataset.']"
-  ],
-  "emerging_trends": "[Based on the papers, briefly describe any emerging trends in this research area. If no papers, state that.]",
-  "summary": "[Provide a final 1-2 sentence summary of the literature review, concluding with a clear recommendation on whether to proceed, refine, or reconsider the idea.]"
-}}
-"""
+    async def review_many(self, research_ideas: List[Dict[str, Any]], max_papers: int = 10) -> List[LiteratureFeedback]:
+        """Review several ideas concurrently, returning feedback in the same order as the input."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REVIEWS)
+
+        async def review(research_idea: Dict[str, Any]) -> LiteratureFeedback:
+            async with semaphore:
+                return await self.run_literature_search_async(research_idea, max_papers)
+
+        return await asyncio.gather(*(review(idea) for idea in research_ideas))
+
+    async def review_literature_batch(self, research_ideas: List[Dict[str, Any]], max_papers: int = 5) -> List[LiteratureFeedback]:
+        """Review several ideas with a single LLM call, returning feedback in input order.
+
+        Paper searches for all ideas run concurrently; the reviews then share one prompt
+        and one structured-output response instead of one call per idea.
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REVIEWS)
+
+        async def search(research_idea: Dict[str, Any]) -> List[Dict[str, Any]]:
+            original_query = self._original_query(research_idea)
+            if not original_query:
+                return []
+            async with semaphore:
+                search_query = await asyncio.to_thread(self.simplify_query_with_llm, original_query)
+                return await self.search_papers_async(search_query, max_papers)
+
+        papers_per_idea = await asyncio.gather(*(search(idea) for idea in research_ideas))
+
+        results: List[Optional[LiteratureFeedback]] = []
+        to_review = []
+        for position, papers in enumerate(papers_per_idea):
+            if not papers:
+                results.append(self._create_basic_review([]))
+            else:
+                results.append(None)
+                to_review.append(position)
+        if not to_review:
+            return results
+
+        idea_blocks = [
+            f"\n### Idea {number}\n" + self._idea_prompt_block(research_ideas[position], papers_per_idea[position], max_papers)
+            for number, position in enumerate(to_review, 1)
+        ]
+        prompt = "".join(idea_blocks)
+
+        reviews = {}
         try:
-            response_text = self.llm_client.generate(prompt)
-            # Clean the response to ensure it's valid JSON
-            review_json = self.llm_client.extract_json(response_text)
-            
-            # Combine with paper details for the final object
-            return LiteratureFeedback(
-                similar_papers=all_papers,
-                novelty_score=review_json.get("novelty_score", 0),
-                novelty_assessment=review_json.get("novelty_assessment", "N/A"),
-                differentiation_suggestions=review_json.get("differentiation_suggestions", []),
-                emerging_trends=review_json.get("emerging_trends", "N/A"),
-                summary=review_json.get("summary", "N/A"),
-                recommended_improvements=[] # This field can be deprecated or kept for compatibility
+            batch_json = await asyncio.to_thread(
+                self.llm_client.generate_json, prompt, LiteratureReviewBatchSchema, system=_BATCH_REVIEW_SYSTEM_PROMPT
             )
+            # Validate item by item so one malformed review does not discard the others
+            for item in batch_json.get("reviews", []):
+                try:
+                    review = LiteratureReviewBatchItem.model_validate(item)
+                except ValidationError:
+                    continue
+                reviews[review.idea_number] = review
         except Exception as e:
-            print(f"Error parsing literature review: {str(e)}")
-            return self._create_basic_review(all_papers)
+            print(f"Error parsing batched literature review: {str(e)}")
+
+        for number, position in enumerate(to_review, 1):
+            papers = papers_per_idea[position]
+            review = reviews.get(number)
+            results[position] = self._feedback_from_review(papers, review) if review else self._create_basic_review(papers)
+        return results
 
     def _create_basic_review(self, papers: List[Dict[str, Any]]) -> LiteratureFeedback:
         """Create a basic review when analysis fails"""
@@ -289,6 +1061,9 @@ if __name__ == '__main__':
         feedback = agent.run_literature_search(example_idea)
         
         print("\n--- Literature Review Feedback ---")
-        print(json.dumps(feedback.__dict__, indent=2, default=str))
+        if orjson is not None:
+            print(orjson.dumps(asdict(feedback), option=orjson.OPT_INDENT_2, default=str).decode())
+        else:
+            print(json.dumps(asdict(feedback), indent=2, default=str))
 
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,238 @@
+"""Response caches for LLM calls and search requests.
+
+Two tiers are provided:
+- ResponseCache: exact-match key/value store, persisted with diskcache when it is
+  installed and kept in process memory otherwise.
+- SemanticCache: nearest-neighbour lookup over sentence embeddings, so paraphrases
+  of an earlier request can reuse its response. Named caches are saved to disk at
+  interpreter exit and reloaded on the next run, minus expired entries.
+"""
+import atexit
+import hashlib
+import os
+import pickle
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Optional
+
+import embeddings
+
+# Optional persistent backend for the exact-match tier
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+CACHE_DIR = os.environ.get(
+    "ASTRO_AGENT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "astro_agent")
+)
+
+# Per-cache disk budget; diskcache evicts least-recently-stored entries beyond it
+CACHE_SIZE_LIMIT = 100 * 1024 * 1024
+
+# Bump when prompt-building code changes in ways the template text does not show, so
+# stale responses are not reused
+PROMPT_TEMPLATE_VERSION = "2"
+
+# Minimum cosine similarity for a semantic cache hit
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+# Entry count at which a semantic cache switches from exact flat search to an HNSW graph,
+# and the graph's neighbours per node and build/search breadth
+HNSW_UPGRADE_SIZE = 10_000
+HNSW_NEIGHBORS = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+# Upper bound on entries per semantic cache. Past it, the oldest entries are dropped
+# until the cache is back to SEMANTIC_CACHE_COMPACT_FRACTION of the bound, so the
+# index is not rebuilt on every addition
+SEMANTIC_CACHE_MAX_ENTRIES = 50_000
+SEMANTIC_CACHE_COMPACT_FRACTION = 0.75
+
+
+def make_key(*parts: Any) -> str:
+    """Hash the given parts into a stable cache key."""
+    return hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Exact-match cache with optional per-entry time-to-live (in seconds)."""
+
+    def __init__(self, name: str, default_ttl: Optional[float] = None, size_limit: int = CACHE_SIZE_LIMIT):
+        self.default_ttl = default_ttl
+        self._disk = (
+            diskcache.Cache(os.path.join(CACHE_DIR, name), size_limit=size_limit)
+            if diskcache is not None else None
+        )
+        self._memory = {}  # key -> (expires_at, value), used when diskcache is missing
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self._disk is not None:
+            return self._disk.get(key, default)
+        entry = self._memory.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at is not None and expires_at < time.time():
+            del self._memory[key]
+            return default
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        if self._disk is not None:
+            self._disk.set(key, value, expire=ttl)
+        else:
+            self._memory[key] = (time.time() + ttl if ttl else None, value)
+
+
+class SemanticCache:
+    """Nearest-neighbour cache keyed by the embedding of a text.
+
+    Does nothing (always misses) when no embedding model is available. Lookups are an
+    exact flat search until the cache holds HNSW_UPGRADE_SIZE entries, after which the
+    faiss index is rebuilt as an approximate HNSW graph. Entries older than ttl seconds
+    (if given) are ignored by lookups and dropped on save and load.
+    """
+
+    def __init__(self, threshold: float = SEMANTIC_CACHE_THRESHOLD, path: Optional[str] = None, ttl: Optional[float] = None):
+        self.threshold = threshold
+        self.ttl = ttl
+        self._index = None  # faiss.IndexFlatIP/IndexHNSWFlat, or a list of vectors when faiss is missing
+        self._values = []
+        self._added_at = []  # time.time() of each entry, parallel to _values
+        self._matrix = None  # stacked copy of the vector list, rebuilt only after additions
+        self._lock = threading.Lock()  # agents may share the cache across worker threads
+        self._path = path  # pickle of (vectors, values); None keeps the cache in memory only
+        if path is not None:
+            self._load()
+            atexit.register(self.save)
+
+    def lookup(self, text: str) -> Any:
+        """Return the value stored for the most similar text, or None below the threshold."""
+        if not self._values:
+            return None
+        vectors = embeddings.encode([text])
+        if vectors is None:
+            return None
+        with self._lock:
+            score, position = self._best_match(vectors)
+            if score < self.threshold or self._expired(self._added_at[position], time.time()):
+                return None
+            return self._values[position]
+
+    def add(self, text: str, value: Any) -> None:
+        vectors = embeddings.encode([text])
+        if vectors is None:
+            return
+        with self._lock:
+            self._append(vectors, [value], [time.time()])
+            if len(self._values) > SEMANTIC_CACHE_MAX_ENTRIES:
+                vectors, values, added_at = self._kept_entries(
+                    self._all_vectors(), self._values, self._added_at,
+                    int(SEMANTIC_CACHE_MAX_ENTRIES * SEMANTIC_CACHE_COMPACT_FRACTION)
+                )
+                self._index, self._values, self._added_at, self._matrix = None, [], [], None
+                self._append(vectors, values, added_at)
+
+    def save(self) -> None:
+        """Write the unexpired cached vectors and values to disk, if the cache has a path."""
+        with self._lock:
+            if self._path is None or not self._values:
+                return
+            vectors, values, added_at = self._kept_entries(
+                self._all_vectors(), self._values, self._added_at, SEMANTIC_CACHE_MAX_ENTRIES
+            )
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            temp_path = self._path + ".tmp"
+            with open(temp_path, "wb") as f:
+                pickle.dump((vectors, values, added_at), f)
+            os.replace(temp_path, self._path)  # readers never see a half-written file
+
+    def _load(self) -> None:
+        try:
+            with open(self._path, "rb") as f:
+                # Files without timestamps predate expiry and fail to unpack, so they are ignored
+                vectors, values, added_at = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError, ImportError):
+            return
+        vectors, values, added_at = self._kept_entries(vectors, values, added_at, SEMANTIC_CACHE_MAX_ENTRIES)
+        if values:
+            self._append(vectors, values, added_at)
+
+    def _expired(self, added_at: float, now: float) -> bool:
+        return self.ttl is not None and added_at < now - self.ttl
+
+    def _kept_entries(self, vectors, values: list, added_at: list, max_entries: int) -> tuple:
+        """The newest max_entries unexpired entries; entries are stored oldest first."""
+        now = time.time()
+        kept = [position for position, timestamp in enumerate(added_at) if not self._expired(timestamp, now)]
+        kept = kept[-max_entries:]
+        return vectors[kept], [values[position] for position in kept], [added_at[position] for position in kept]
+
+    def _all_vectors(self):
+        if isinstance(self._index, list):
+            return self._stacked_vectors()
+        return self._index.reconstruct_n(0, self._index.ntotal)
+
+    def _append(self, vectors, values: list, added_at: list) -> None:
+        if self._index is None:
+            self._index = self._new_index(vectors.shape[1])
+        if isinstance(self._index, list):
+            self._index.extend(vectors)
+        else:
+            self._index.add(vectors)
+            if self._index.ntotal >= HNSW_UPGRADE_SIZE and not hasattr(self._index, "hnsw"):
+                self._index = self._to_hnsw(self._index)
+        self._values.extend(values)
+        self._added_at.extend(added_at)
+
+    def _new_index(self, dim: int):
+        try:
+            import faiss
+        except ImportError:
+            return []
+        return faiss.IndexFlatIP(dim)
+
+    def _to_hnsw(self, flat_index):
+        """Rebuild a flat inner-product index as an HNSW graph holding the same vectors."""
+        import faiss
+        hnsw_index = faiss.IndexHNSWFlat(flat_index.d, HNSW_NEIGHBORS, faiss.METRIC_INNER_PRODUCT)
+        hnsw_index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        hnsw_index.add(flat_index.reconstruct_n(0, flat_index.ntotal))
+        hnsw_index.hnsw.efSearch = HNSW_EF_SEARCH
+        return hnsw_index
+
+    def _stacked_vectors(self):
+        """The numpy fallback's vectors as one contiguous matrix, restacked only when entries were added."""
+        if self._matrix is None or len(self._matrix) != len(self._index):
+            import numpy as np
+            self._matrix = np.stack(self._index)
+        return self._matrix
+
+    def _best_match(self, vectors) -> tuple:
+        if isinstance(self._index, list):
+            scores = self._stacked_vectors() @ vectors[0]
+            position = int(scores.argmax())
+            return float(scores[position]), position
+        scores, positions = self._index.search(vectors, 1)
+        return float(scores[0][0]), int(positions[0][0])
+
+
+@lru_cache(maxsize=None)
+def get_response_cache(name: str, default_ttl: Optional[float] = None) -> ResponseCache:
+    """Return the process-wide exact-match cache with the given name."""
+    return ResponseCache(name, default_ttl)
+
+
+@lru_cache(maxsize=None)
+def get_semantic_cache(name: str, ttl: Optional[float] = None) -> SemanticCache:
+    """Return the process-wide semantic cache with the given name, reloading any saved entries.
+
+    Entries older than ttl seconds are not served, and are not kept across runs.
+    """
+    # Embeddings from a different model are not comparable, so the file is per model
+    model_tag = embeddings.EMBEDDING_MODEL_NAME.rsplit("/", 1)[-1]
+    return SemanticCache(path=os.path.join(CACHE_DIR, "semantic", f"{name}-{model_tag}.pkl"), ttl=ttl)
@@ -1,5 +1,111 @@
-from typing import Optional, Dict, Any, List
-import os
+from typing import Optional, Dict, Any, Iterable
+from functools import lru_cache
+import json
+import re
+
+from llm_cache import get_response_cache, make_key
+
+# orjson is optional; it parses model responses several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Default lifetime (seconds) of responses cached with cache=True
+RESPONSE_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Streamed JSON responses that have not opened an object within this many characters
+# are abandoned, since the model is answering in prose (e.g. declining) instead
+MAX_JSON_PREAMBLE_CHARS = 2000
+
+
+def _read_json_object(chunks: Iterable[str]) -> str:
+    """Consume streamed text until the first top-level JSON object closes, and return it.
+
+    Stops reading as soon as the braces balance, so any prose the model appends after
+    the object is never waited for, and gives up early when no object has started after
+    MAX_JSON_PREAMBLE_CHARS. Braces inside JSON strings are ignored. Returns everything
+    read if the object never closes.
+    """
+    parts, depth, in_string, escaped = [], 0, False, False
+    preamble_chars = 0
+    for chunk in chunks:
+        if not depth:
+            preamble_chars += len(chunk)
+            if preamble_chars > MAX_JSON_PREAMBLE_CHARS and '{' not in chunk:
+                parts.append(chunk)
+                return "".join(parts)
+        for position, char in enumerate(chunk):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"' and depth:
+                in_string = True
+            elif char == '{':
+                depth += 1
+            elif char == '}' and depth:
+                depth -= 1
+                if not depth:
+                    parts.append(chunk[:position + 1])
+                    return "".join(parts)
+        parts.append(chunk)
+    return "".join(parts)
+
+
+# Outermost {...} span of a response, skipping code fences and prose around the object
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Model used per provider for each routing tier: "hard" for reasoning-heavy calls
+# (literature review, proposal writing) and "cheap" for short, mechanical ones
+MODEL_TIERS = {
+    "google": {"hard": "gemini-2.5-pro-preview-06-05", "cheap": "gemini-2.5-flash-preview-05-20"},
+    "claude": {"hard": "claude-sonnet-4-20250514", "cheap": "claude-3-5-haiku-20241022"},
+    # Azure is pinned to a single hard-coded deployment
+    "azure": {"hard": "o1", "cheap": "o1"},
+}
+
+
+@lru_cache(maxsize=8)
+def _get_provider_client(provider: str, api_key: str, temperature: Optional[float] = None):
+    """Create the underlying SDK client once per provider/key so all agents share it.
+
+    Reusing the client keeps its HTTP connection pool (and TLS sessions) warm across
+    agents instead of opening a fresh one per LLMClient instance.
+    """
+    if provider == "google":
+        try:
+            from google import genai
+            return genai.Client(api_key=api_key)
+        except ImportError:
+            raise ImportError("google-generativeai is not installed")
+    elif provider == "azure":
+        try:
+            from langchain_openai import AzureChatOpenAI
+            # Hard-coded Azure configuration
+            return AzureChatOpenAI(
+                azure_endpoint="https://utbd-omodels-advanced.openai.azure.com",
+                azure_deployment="o1",
+                api_version="2025-01-01-preview",
+                api_key=api_key,
+                temperature=temperature
+            )
+        except ImportError:
+            raise ImportError("langchain_openai is not installed")
+    elif provider == "claude":
+        try:
+            import anthropic
+            return anthropic.Anthropic(api_key=api_key)
+        except ImportError:
+            raise ImportError("anthropic is not installed")
+    else:
+        raise ValueError(f"Unsupported provider: {provider}")
+
 
 class LLMClient:
     """Wrapper for LLM clients to provide a consistent interface"""
@@ -16,91 +122,161 @@ class LLMClient:
         self.provider = provider
         self.temperature = temperature
         
-        if provider == "google":
-            try:
-                from google import genai
-                self.client = genai.Client(api_key=api_key)
-            except ImportError:
-                raise ImportError("google-generativeai is not installed")
-        elif provider == "azure":
-            try:
-                from langchain_openai import AzureChatOpenAI
-                # Hard-coded Azure configuration
-                self.client = AzureChatOpenAI(
-                    azure_endpoint="https://utbd-omodels-advanced.openai.azure.com",
-                    azure_deployment="o1",
-                    api_version="2025-01-01-preview",
-                    api_key=api_key,
-                    temperature=self.temperature
-                )
-            except ImportError:
-                raise ImportError("langchain_openai is not installed")
-        elif provider == "claude":
-            try:
-                import anthropic
-                self.client = anthropic.Anthropic(api_key=api_key)
-            except ImportError:
-                raise ImportError("anthropic is not installed")
-        else:
-            raise ValueError(f"Unsupported provider: {provider}")
+        # Only the Azure client is bound to a temperature; the others take it per request
+        client_temperature = temperature if provider == "azure" else None
+        self.client = _get_provider_client(provider, api_key, client_temperature)
+
+        # Provider-specific senders, resolved once rather than branched on per call
+        self._send_content = {
+            "google": self._send_google,
+            "azure": self._send_azure,
+            "claude": self._send_claude,
+        }[provider]
+        self._send_json = {
+            "google": self._send_google_json,
+            "azure": self._send_azure_json,
+            "claude": self._send_claude_json,
+        }[provider]
     
-    def generate(self, prompt: str) -> str:
+    def generate(self, prompt: str, tier: str = "hard", system: Optional[str] = None, cache: bool = False, cache_ttl: Optional[float] = None) -> str:
         """Alias for generate_content for compatibility."""
-        return self.generate_content(prompt)
+        return self.generate_content(prompt, tier=tier, system=system, cache=cache, cache_ttl=cache_ttl)
 
-    def generate_content(self, prompt: str) -> str:
+    def generate_content(self, prompt: str, tier: str = "hard", system: Optional[str] = None, cache: bool = False, cache_ttl: Optional[float] = None) -> str:
         """Generate content using the configured LLM
         
         Args:
             prompt: The prompt to send to the LLM
+            tier: Model tier from MODEL_TIERS, 'hard' or 'cheap'
+            system: Optional system prompt. Keep it free of per-call content so the
+                provider's prompt caching can reuse it across calls.
+            cache: Reuse the response to a byte-identical earlier request. Off by default,
+                since callers such as idea generation want a fresh sample on every call.
+            cache_ttl: Lifetime of the cached response in seconds (RESPONSE_CACHE_TTL by default)
             
         Returns:
             Generated text response
         """
-        if self.provider == "google":
-            from google.genai import types
-            config = types.GenerateContentConfig(temperature=self.temperature)
-            response = self.client.models.generate_content(
-                model="gemini-2.5-pro-preview-06-05", 
-                contents=prompt,
-                config=config
-            )
-            return response.text
-        elif self.provider == "azure":
-            # For Azure, we can directly invoke the client
-            response = self.client.invoke(prompt)
-            return response.content
-        elif self.provider == "claude":
-            # For Claude, we need to structure the message differently
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4096,
-                temperature=self.temperature,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
-            return response.content[0].text
-        
-        # Fallback (should never reach here)
-        raise ValueError(f"Unsupported provider: {self.provider}")
+        model = MODEL_TIERS[self.provider][tier]
+        if not cache:
+            return self._send_content(prompt, model, system)
+
+        key = make_key(self.provider, model, self.temperature, system, prompt)
+        response_cache = get_response_cache("llm_responses")
+        text = response_cache.get(key)
+        if text is None:
+            text = self._send_content(prompt, model, system)
+            response_cache.set(key, text, RESPONSE_CACHE_TTL if cache_ttl is None else cache_ttl)
+        return text
+
+    def _send_google(self, prompt: str, model: str, system: Optional[str]) -> str:
+        from google.genai import types
+        config = types.GenerateContentConfig(temperature=self.temperature, system_instruction=system)
+        response = self.client.models.generate_content(
+            model=model, 
+            contents=prompt,
+            config=config
+        )
+        return response.text
+
+    def _send_azure(self, prompt: str, model: str, system: Optional[str]) -> str:
+        # For Azure, we can directly invoke the client
+        response = self.client.invoke(self._azure_messages(prompt, system))
+        return response.content
+
+    def _send_claude(self, prompt: str, model: str, system: Optional[str]) -> str:
+        # For Claude, we need to structure the message differently
+        response = self.client.messages.create(**self._claude_request(prompt, model, system))
+        return response.content[0].text
+
+    def generate_json(self, prompt: str, schema: Optional[Any] = None, tier: str = "hard", system: Optional[str] = None, cache: bool = False, cache_ttl: Optional[float] = None) -> Dict[str, Any]:
+        """Generate a JSON object, using the provider's structured output mode when available.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            schema: Optional response schema (Gemini schema dict or pydantic model) constraining the output
+            tier: Model tier from MODEL_TIERS, 'hard' or 'cheap'
+            system: Optional static system prompt (see generate_content)
+            cache: Reuse the parsed object from a byte-identical earlier request (see
+                generate_content). Only responses that parsed are stored.
+            cache_ttl: Lifetime of the cached object in seconds (RESPONSE_CACHE_TTL by default)
+
+        Returns:
+            Parsed JSON object
+        """
+        model = MODEL_TIERS[self.provider][tier]
+        if not cache:
+            return self._send_json(prompt, model, schema, system)
+
+        key = make_key("json", self.provider, model, self.temperature, getattr(schema, "__name__", schema), system, prompt)
+        response_cache = get_response_cache("llm_responses")
+        result = response_cache.get(key)
+        if result is None:
+            result = self._send_json(prompt, model, schema, system)
+            response_cache.set(key, result, RESPONSE_CACHE_TTL if cache_ttl is None else cache_ttl)
+        return result
+
+    def _send_google_json(self, prompt: str, model: str, schema: Optional[Any], system: Optional[str]) -> Dict[str, Any]:
+        from google.genai import types
+        config = types.GenerateContentConfig(
+            temperature=self.temperature,
+            system_instruction=system,
+            response_mime_type="application/json",
+            response_schema=schema
+        )
+        response = self.client.models.generate_content(model=model, contents=prompt, config=config)
+        return self.extract_json(response.text)
+
+    def _send_azure_json(self, prompt: str, model: str, schema: Optional[Any], system: Optional[str]) -> Dict[str, Any]:
+        # JSON mode guarantees a syntactically valid object; the schema is described in the prompt
+        response = self.client.invoke(self._azure_messages(prompt, system), response_format={"type": "json_object"})
+        return self.extract_json(response.content)
+
+    def _send_claude_json(self, prompt: str, model: str, schema: Optional[Any], system: Optional[str]) -> Dict[str, Any]:
+        # Claude has no JSON mode, so rely on the prompt and extract the object. The response
+        # is streamed and the connection closed once the object is complete, so a trailing
+        # explanation is not generated in full
+        with self.client.messages.stream(**self._claude_request(prompt, model, system)) as stream:
+            return self.extract_json(_read_json_object(stream.text_stream))
+
+    def _claude_request(self, prompt: str, model: str, system: Optional[str]) -> Dict[str, Any]:
+        """Build the Anthropic Messages API arguments for one request."""
+        request = {
+            "model": model,
+            "max_tokens": 4096,
+            "temperature": self.temperature,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        if system:
+            # Mark the static system prompt as a cache breakpoint, so repeat calls read
+            # it from Anthropic's prompt cache instead of paying for it again
+            request["system"] = [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+        return request
+
+    def _azure_messages(self, prompt: str, system: Optional[str]):
+        """Build the LangChain input: the bare prompt, or (role, content) pairs with a system prompt."""
+        if not system:
+            return prompt
+        return [("system", system), ("human", prompt)]
 
     def extract_json(self, text: str) -> Dict[str, Any]:
         """Extracts a JSON object from a string, cleaning it first."""
-        import json
+        match = _JSON_OBJECT_RE.search(text)
+        if match is None:
+            raise ValueError("No JSON object found in the text.")
         try:
-            # Find the first '{' and the last '}' to extract the JSON block
-            start = text.find('{')
-            end = text.rfind('}') + 1
-            if start == -1 or end == 0:
-                raise ValueError("No JSON object found in the text.")
-            
-            json_str = text[start:end]
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
+            return _json_loads(match.group(0))
+        except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
             print(f"Error decoding JSON: {e}")
             print(f"Original text: {text}")
-            raise ValueError("Failed to parse JSON from the model's response.") 
\ No newline at end of file
+            raise ValueError("Failed to parse JSON from the model's response.")
+
+
+@lru_cache(maxsize=8)
+def get_llm_client(api_key: str, provider: str = "azure", temperature: float = 0.5) -> LLMClient:
+    """Return the LLMClient for these settings, creating it once so agents can share it.
+
+    LLMClient holds no per-call state, so a single instance serves every agent
+    constructed with the same key, provider and temperature.
+    """
+    return LLMClient(api_key, provider, temperature)
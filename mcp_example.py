@@ -10,16 +10,81 @@ not passed with each tool call.
 """
 
 import json
-import asyncio
+import sys
 from typing import Dict, Any
 
+# orjson is optional; it serializes the nested proposal payloads faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize obj to a compact JSON string, as the tool payloads expect."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()  # orjson returns bytes
+    # Same compact separators as orjson, so the output does not depend on which is installed
+    return json.dumps(obj, separators=(",", ":"))
+
+
+# Example payloads. They never change, so they are serialized once at import.
+# This would typically be the output from structure_idea or generate_idea
+_BASE_PROPOSAL = {
+    "title": "Machine Learning Analysis of Early Galaxy Formation",
+    "subfields": ["Cosmology", "Galaxy Formation"],
+    "idea": {
+        "Research Question": "How can machine learning techniques improve our understanding of galaxy formation processes in the early universe?",
+        "Proposed Solution": "Apply convolutional neural networks to analyze deep field images from HST and JWST to identify and classify early galaxies.",
+        "Background": "Galaxy formation in the early universe is a fundamental process that shapes cosmic structure...",
+        "Expected Outcomes": "A catalog of early galaxies with improved classification accuracy and insights into formation mechanisms."
+    }
+}
+
+# The reviewer also weighs the student's constraints. The variant is only
+# serialized, so a shallow merge is enough and the base is never mutated.
+_FEEDBACK_PROPOSAL = {**_BASE_PROPOSAL, "skill_level": "undergraduate", "time_frame": "1 year"}
+
+# Example expert feedback (this would come from the expert_feedback tool)
+_EXPERT_FEEDBACK = {
+    "scientific_validity": {
+        "strengths": ["Novel application of ML to galaxy formation", "Uses state-of-the-art telescope data"],
+        "concerns": ["May need more specific methodology", "Should address data quality issues"]
+    },
+    "methodology": {
+        "strengths": ["CNNs are appropriate for image analysis"],
+        "concerns": ["Need to specify training data sources", "Validation strategy unclear"]
+    },
+    "novelty_assessment": "The approach is novel and could contribute significantly to the field.",
+    "impact_assessment": "High potential impact if successful.",
+    "feasibility_assessment": "Feasible for an undergraduate with proper guidance.",
+    "recommendations": [
+        "Specify the exact CNN architecture and training approach",
+        "Include a validation strategy using known galaxy samples",
+        "Consider data augmentation techniques for limited training data"
+    ],
+    "summary": "Strong concept with good potential. Needs more methodological detail and validation strategy."
+}
+
+_PROPOSAL_JSON = _dumps(_BASE_PROPOSAL)
+_FEEDBACK_PROPOSAL_JSON = _dumps(_FEEDBACK_PROPOSAL)
+_EXPERT_FEEDBACK_JSON = _dumps(_EXPERT_FEEDBACK)
+
+
+# Arguments shared by every tool. API keys are not among them; the server
+# reads those from its environment.
+_COMMON_ARGS = {
+    "provider": "google",  # optional, defaults to "google"
+    "temperature": 0.5,    # optional, defaults to 0.5
+}
+
 
 # Example usage functions
 def example_generate_idea():
     """Example of how to generate a research idea."""
     return {
-        "provider": "google",  # optional, defaults to "google"
-        "temperature": 0.7,    # optional, defaults to 0.5
+        **_COMMON_ARGS,
+        "temperature": 0.7,
         "interests": "galaxy formation, cosmology, dark matter",
         "skill_level": "undergraduate",
         "resources": "Python, public datasets, university computing cluster",
@@ -30,95 +95,33 @@ def example_generate_idea():
 def example_structure_idea():
     """Example of how to structure a raw research idea."""
     return {
-        "provider": "google",  # optional, defaults to "google"
-        "temperature": 0.5,    # optional, defaults to 0.5
+        **_COMMON_ARGS,
         "user_idea": "I want to study how galaxies form in the early universe using machine learning to analyze telescope data"
     }
 
 
 def example_literature_review():
     """Example of how to perform a literature review."""
-    # This would typically be the output from structure_idea or generate_idea
-    proposal = {
-        "title": "Machine Learning Analysis of Early Galaxy Formation",
-        "subfields": ["Cosmology", "Galaxy Formation"],
-        "idea": {
-            "Research Question": "How can machine learning techniques improve our understanding of galaxy formation processes in the early universe?",
-            "Proposed Solution": "Apply convolutional neural networks to analyze deep field images from HST and JWST to identify and classify early galaxies.",
-            "Background": "Galaxy formation in the early universe is a fundamental process that shapes cosmic structure...",
-            "Expected Outcomes": "A catalog of early galaxies with improved classification accuracy and insights into formation mechanisms."
-        }
-    }
-    
     return {
-        "provider": "google",  # optional, defaults to "google"
-        "temperature": 0.5,    # optional, defaults to 0.5
-        "proposal_json": json.dumps(proposal)
+        **_COMMON_ARGS,
+        "proposal_json": _PROPOSAL_JSON
     }
 
 
 def example_expert_feedback():
     """Example of how to get expert feedback."""
-    # Same proposal as above
-    proposal = {
-        "title": "Machine Learning Analysis of Early Galaxy Formation",
-        "subfields": ["Cosmology", "Galaxy Formation"],
-        "skill_level": "undergraduate",
-        "time_frame": "1 year",
-        "idea": {
-            "Research Question": "How can machine learning techniques improve our understanding of galaxy formation processes in the early universe?",
-            "Proposed Solution": "Apply convolutional neural networks to analyze deep field images from HST and JWST to identify and classify early galaxies.",
-            "Background": "Galaxy formation in the early universe is a fundamental process that shapes cosmic structure...",
-            "Expected Outcomes": "A catalog of early galaxies with improved classification accuracy and insights into formation mechanisms."
-        }
-    }
-    
     return {
-        "provider": "google",  # optional, defaults to "google"
-        "temperature": 0.5,    # optional, defaults to 0.5
-        "proposal_json": json.dumps(proposal)
+        **_COMMON_ARGS,
+        "proposal_json": _FEEDBACK_PROPOSAL_JSON
     }
 
 
 def example_improve_idea():
     """Example of how to improve an idea with feedback."""
-    original_proposal = {
-        "title": "Machine Learning Analysis of Early Galaxy Formation",
-        "subfields": ["Cosmology", "Galaxy Formation"],
-        "idea": {
-            "Research Question": "How can machine learning techniques improve our understanding of galaxy formation processes in the early universe?",
-            "Proposed Solution": "Apply convolutional neural networks to analyze deep field images from HST and JWST to identify and classify early galaxies.",
-            "Background": "Galaxy formation in the early universe is a fundamental process...",
-            "Expected Outcomes": "A catalog of early galaxies with improved classification accuracy."
-        }
-    }
-    
-    # Example expert feedback (this would come from the expert_feedback tool)
-    expert_feedback = {
-        "scientific_validity": {
-            "strengths": ["Novel application of ML to galaxy formation", "Uses state-of-the-art telescope data"],
-            "concerns": ["May need more specific methodology", "Should address data quality issues"]
-        },
-        "methodology": {
-            "strengths": ["CNNs are appropriate for image analysis"],
-            "concerns": ["Need to specify training data sources", "Validation strategy unclear"]
-        },
-        "novelty_assessment": "The approach is novel and could contribute significantly to the field.",
-        "impact_assessment": "High potential impact if successful.",
-        "feasibility_assessment": "Feasible for an undergraduate with proper guidance.",
-        "recommendations": [
-            "Specify the exact CNN architecture and training approach",
-            "Include a validation strategy using known galaxy samples",
-            "Consider data augmentation techniques for limited training data"
-        ],
-        "summary": "Strong concept with good potential. Needs more methodological detail and validation strategy."
-    }
-    
     return {
-        "provider": "google",  # optional, defaults to "google"
-        "temperature": 0.5,    # optional, defaults to 0.5
-        "original_proposal_json": json.dumps(original_proposal),
-        "reflection_json": json.dumps(expert_feedback),
+        **_COMMON_ARGS,
+        "original_proposal_json": _PROPOSAL_JSON,
+        "reflection_json": _EXPERT_FEEDBACK_JSON,
         # literature_json is optional
     }
 
@@ -126,39 +129,40 @@ def example_improve_idea():
 def example_full_pipeline():
     """Example of running the full pipeline."""
     return {
-        "provider": "google",  # optional, defaults to "google"
-        "temperature": 0.5,    # optional, defaults to 0.5
+        **_COMMON_ARGS,
         "user_idea": "I want to use artificial intelligence to discover new types of stars by analyzing spectra from large sky surveys"
     }
 
 
+_EXAMPLES = [
+    ("Generate Idea", example_generate_idea),
+    ("Structure Idea", example_structure_idea),
+    ("Literature Review", example_literature_review),
+    ("Expert Feedback", example_expert_feedback),
+    ("Improve Idea", example_improve_idea),
+    ("Full Pipeline", example_full_pipeline),
+]
+
+
+def _dumps_pretty(obj: Any) -> bytes:
+    """Serialize obj to indented JSON bytes for display."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
 def print_examples():
     """Print all example tool calls."""
-    print("=== Astronomy Research Assistant MCP Server Examples ===\n")
-    
-    print("1. Generate Idea:")
-    print(json.dumps(example_generate_idea(), indent=2))
-    print("\n" + "="*60 + "\n")
-    
-    print("2. Structure Idea:")
-    print(json.dumps(example_structure_idea(), indent=2))
-    print("\n" + "="*60 + "\n")
-    
-    print("3. Literature Review:")
-    print(json.dumps(example_literature_review(), indent=2))
-    print("\n" + "="*60 + "\n")
-    
-    print("4. Expert Feedback:")
-    print(json.dumps(example_expert_feedback(), indent=2))
-    print("\n" + "="*60 + "\n")
-    
-    print("5. Improve Idea:")
-    print(json.dumps(example_improve_idea(), indent=2))
-    print("\n" + "="*60 + "\n")
-    
-    print("6. Full Pipeline:")
-    print(json.dumps(example_full_pipeline(), indent=2))
-    print("\n" + "="*60 + "\n")
+    # Assemble everything and write it in one go instead of one print per line
+    separator = b"\n" + b"=" * 60 + b"\n\n"
+    buf = bytearray(b"=== Astronomy Research Assistant MCP Server Examples ===\n\n")
+    for i, (title, example) in enumerate(_EXAMPLES, 1):
+        buf += f"{i}. {title}:\n".encode()
+        buf += _dumps_pretty(example())
+        buf += b"\n" + separator
+    sys.stdout.flush()
+    sys.stdout.buffer.write(buf)
+    sys.stdout.buffer.flush()
 
 
 if __name__ == "__main__":
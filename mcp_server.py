@@ -21,7 +21,13 @@ import asyncio
 import json
 import os
 from typing import Dict, Any, List
-from dataclasses import asdict
+from dataclasses import asdict, is_dataclass
+
+# orjson is optional; it is faster than json and serializes dataclasses natively
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # MCP imports
 import mcp.server.stdio
@@ -37,6 +43,10 @@ from reflection_agent import AstronomyReflectionAgent
 # Global server instance
 server = Server("astronomy-idea-assistant")
 
+# Caps how many pipelines review at once so concurrent calls don't trip provider rate limits
+MAX_CONCURRENT_REVIEWS = 5
+_review_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REVIEWS)
+
 # Global API key storage
 API_KEYS = {
     'google': None,
@@ -78,12 +88,26 @@ def _get_temperature(params: Dict[str, Any]) -> float:
     """Extracts temperature from parameters, with a default."""
     return params.get('temperature', 0.5)
 
+def _json_default(obj: Any) -> Any:
+    """Let the json fallback serialize dataclass results the way orjson does."""
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool result, including any dataclasses in it, to a JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=_json_default)
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 def _parse_json_input(data: Any) -> Dict[str, Any]:
     """Parse JSON input, handling both strings and objects."""
     if isinstance(data, str):
         try:
-            return json.loads(data)
-        except json.JSONDecodeError:
+            return _json_loads(data)
+        except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses it
             return {"description": data}
     return data
 
@@ -146,7 +170,7 @@ async def generate_idea(name: str, arguments: dict | None) -> List[types.TextCon
             available_resources=resources
         )
         
-        return [types.TextContent(type="text", text=json.dumps(result))]
+        return [types.TextContent(type="text", text=_dumps(result))]
         
     except Exception as e:
         return [types.TextContent(type="text", text=f"Error generating idea: {str(e)}")]
@@ -202,7 +226,7 @@ async def structure_idea(name: str, arguments: dict | None) -> List[types.TextCo
         agent = IdeaAgent(api_key=api_key, provider=provider, temperature=temperature)
         result = agent.structure_and_rephrase_idea(user_idea=args['user_idea'])
         
-        return [types.TextContent(type="text", text=json.dumps(result))]
+        return [types.TextContent(type="text", text=_dumps(result))]
         
     except Exception as e:
         import traceback
@@ -260,7 +284,7 @@ async def literature_review(name: str, arguments: dict | None) -> List[types.Tex
         agent = LiteratureAgent(api_key=api_key, provider=provider, temperature=temperature)
         result = agent.run_literature_search(research_idea=proposal)
         
-        return [types.TextContent(type="text", text=json.dumps(asdict(result)))]
+        return [types.TextContent(type="text", text=_dumps(result))]
         
     except Exception as e:
         return [types.TextContent(type="text", text=f"Error performing literature review: {str(e)}")]
@@ -318,7 +342,7 @@ async def expert_feedback(name: str, arguments: dict | None) -> List[types.TextC
         agent = AstronomyReflectionAgent(api_key=api_key, provider=provider, temperature=temperature)
         result = agent.provide_feedback(research_proposal=proposal)
         
-        return [types.TextContent(type="text", text=json.dumps(asdict(result)))]
+        return [types.TextContent(type="text", text=_dumps(result))]
         
     except Exception as e:
         return [types.TextContent(type="text", text=f"Error generating expert feedback: {str(e)}")]
@@ -382,7 +406,7 @@ async def improve_idea(name: str, arguments: dict | None) -> List[types.TextCont
         agent = IdeaAgent(api_key=api_key, provider=provider, temperature=temperature)
         result = agent.improve_idea(reflection_feedback=expert_feedback, literature_feedback=literature_feedback)
         
-        return [types.TextContent(type="text", text=json.dumps(result))]
+        return [types.TextContent(type="text", text=_dumps(result))]
         
     except Exception as e:
         return [types.TextContent(type="text", text=f"Error improving idea: {str(e)}")]
@@ -472,11 +496,17 @@ async def full_pipeline(name: str, arguments: dict | None) -> List[types.TextCon
                 available_resources=resources
             )
         
-        # Step 2: Literature Review
-        lit_feedback = lit_agent.run_literature_search(research_idea=structured_proposal)
-        
-        # Step 3: Expert Feedback
-        expert_feedback_result = reflection_agent.provide_feedback(research_proposal=structured_proposal)
+        # Steps 2-3: Literature Review and Expert Feedback only depend on the
+        # proposal, so run them side by side
+        async with _review_semaphore:
+            try:
+                lit_feedback, expert_feedback_result = await asyncio.gather(
+                    lit_agent.run_literature_search_async(research_idea=structured_proposal),
+                    asyncio.to_thread(reflection_agent.provide_feedback, research_proposal=structured_proposal)
+                )
+            finally:
+                # The agent is per call, so release its aiohttp session with it
+                await lit_agent.close()
         
         # Step 4: Improve Idea
         improved_proposal = idea_agent.improve_idea(
@@ -487,12 +517,12 @@ async def full_pipeline(name: str, arguments: dict | None) -> List[types.TextCon
         # 5. Compile final result
         final_result = {
             "initial_proposal": structured_proposal,
-            "literature_review": asdict(lit_feedback),
-            "expert_feedback": asdict(expert_feedback_result),
+            "literature_review": lit_feedback,
+            "expert_feedback": expert_feedback_result,
             "improved_proposal": improved_proposal
         }
         
-        return [types.TextContent(type="text", text=json.dumps(final_result))]
+        return [types.TextContent(type="text", text=_dumps(final_result))]
         
     except Exception as e:
         return [types.TextContent(type="text", text=f"Error running full pipeline: {str(e)}")]
@@ -707,4 +737,10 @@ async def main():
         )
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    # uvloop is optional and not available on Windows; it speeds up the event loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
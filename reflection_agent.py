@@ -4,13 +4,7 @@ from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
 
 # Import the LLMClient wrapper
-from llm_client import LLMClient
-
-# Try to import Google's genai library for backward compatibility
-try:
-    from google import genai
-except ImportError:
-    genai = None
+from llm_client import LLMClient, get_llm_client
 
 # Remove incorrect import block from idea_agent_twocalls
 # from idea_agent_twocalls import (
@@ -50,19 +44,21 @@ class AstronomyReflectionAgent:
     def __post_init__(self):
         """Initialize the LLM client after the dataclass is created."""
         try:
-            self.llm_client = LLMClient(self.api_key, self.provider, self.temperature)
+            self.llm_client = get_llm_client(self.api_key, self.provider, self.temperature)
         except ValueError as e:
             raise ValueError(f"Error initializing ReflectionAgent's LLM client: {str(e)}")
 
-    def provide_feedback(self, research_proposal: Dict[str, Any]) -> ProposalFeedback:
+    def provide_feedback(self, research_proposal: Dict[str, Any], cache: bool = False) -> ProposalFeedback:
         """
         Evaluates a structured research proposal and returns feedback.
+
+        Each call produces a fresh review unless cache is True, in which case feedback on
+        an unchanged proposal is reused rather than regenerated.
         """
         prompt = self._create_evaluation_prompt(research_proposal)
         
         try:
-            response_text = self.llm_client.generate(prompt)
-            feedback_json = self.llm_client.extract_json(response_text)
+            feedback_json = self.llm_client.generate_json(prompt, cache=cache)
             
             return ProposalFeedback(
                 scientific_validity=feedback_json.get("scientific_validity", {}),
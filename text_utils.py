@@ -0,0 +1,77 @@
+"""Small text helpers for keeping prompts within a token budget."""
+import re
+from functools import lru_cache
+
+# Rough characters-per-token ratio for English prose, used when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tiktoken encoding once, or return None if tiktoken is not installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens, marking the cut with an ellipsis.
+
+    Without tiktoken the cut falls on the last word boundary within the
+    character budget.
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens]).rstrip() + "..."
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(' ', 1)[0] + "..."
+
+
+def shrink_middle(text: str, max_tokens: int = 400) -> str:
+    """Trim text to roughly max_tokens by dropping sentences from the middle.
+
+    Background and methodology sections state their framing at the start and their
+    conclusions at the end, so those are kept and the middle is elided.
+    """
+    if not text or estimate_tokens(text) <= max_tokens:
+        return text
+
+    half_budget = max_tokens * CHARS_PER_TOKEN // 2
+    sentences = _SENTENCE_SPLIT_RE.split(text.strip())
+
+    head, head_len = [], 0
+    for sentence in sentences:
+        if head_len + len(sentence) > half_budget:
+            break
+        head.append(sentence)
+        head_len += len(sentence) + 1
+
+    tail, tail_len = [], 0
+    for sentence in reversed(sentences[len(head):]):
+        if tail_len + len(sentence) > half_budget:
+            break
+        tail.append(sentence)
+        tail_len += len(sentence) + 1
+    tail.reverse()
+
+    # Fall back to a character cut when single sentences are longer than the budget
+    head_text = " ".join(head) if head else text[:half_budget]
+    tail_text = " ".join(tail) if tail else text[-half_budget:]
+    return f"{head_text} [...] {tail_text}"